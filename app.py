@@ -9,25 +9,56 @@
     python3 app.py --quarter 2026Q1         (특정 분기)
     python3 app.py --port 8080              (포트 변경)
     python3 app.py --setup                  (설정 마법사 재실행)
+    python3 app.py --serve --threads 16     (여러 명이 함께 쓰는 운영 서버, waitress)
+    python3 app.py --import-profile         (모듈별 import 시간 출력)
+    python3 app.py --metrics                (요청·내부 작업 시간 계측, /api/metrics)
+
+pandas·openpyxl(부가세 셀프 체크·패키지 생성)은 해당 기능을 처음 쓸 때 불러옵니다.
 """
 import argparse
+import hashlib
 import json
+import multiprocessing
 import os
 import shutil
+import socket
+import sys
 import threading
 import webbrowser
-from datetime import datetime
+import zipfile
+from collections import defaultdict
+from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import unquote
+
+if "--import-profile" in sys.argv:  # 아래 import부터 모듈별 시간 기록
+    import import_profile
+    import_profile.install()
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
+from werkzeug.exceptions import RequestEntityTooLarge
 
-from config import load_config, is_configured, run_setup_wizard
+from config import load_config, config_version, is_configured, run_setup_wizard, start_config_watcher
+from events import notify_changed, subscribe, stream
+from file_index import group_files, invalidate as invalidate_index, list_files, version as index_version
 from paths import APP_DIR, INPUT_DIR, OUTPUT_DIR, TEMPLATE_DIR
+from uploads import iter_zip_members, save_stream
+import metrics
+import resumable
+import vat_jobs
 
 INPUT_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 app = Flask(__name__, template_folder=str(TEMPLATE_DIR))
+app.config["MAX_CONTENT_LENGTH"] = load_config()["max_upload_mb"] * 1024 * 1024
+metrics.init_app(app)  # TAX_DASHBOARD_METRICS=1일 때만 (--metrics는 main에서)
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def handle_too_large(e):
+    limit_mb = app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)
+    return jsonify({"status": "error", "message": f"파일이 너무 큽니다 (최대 {limit_mb}MB)"}), 413
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 플랫폼 정의 (tax_package.py와 동일)
@@ -308,6 +339,11 @@ def get_corp_tax_info(cfg):
     }
 
 
+# 업로드 허용 확장자
+VAT_EXTENSIONS = ['.xlsx', '.xls', '.pdf', '.csv', '.zip']
+CORP_EXTENSIONS = ['.xlsx', '.xls', '.pdf', '.csv', '.zip', '.jpg', '.jpeg', '.png', '.hwp', '.doc', '.docx']
+
+
 # 현재 분기 (서버 시작 시 설정)
 CURRENT_QUARTER = None
 
@@ -327,30 +363,30 @@ def get_quarter_dir(quarter=None):
 
 def get_corp_dir(year=None):
     """법인세 자료 저장 디렉토리"""
-    cfg = load_config()
-    y = year or str(cfg["corp_tax_year"])
+    y = year or str(load_config()["corp_tax_year"])
     d = INPUT_DIR / f"법인세_{y}"
     d.mkdir(exist_ok=True)
     return d
 
 
+def _file_info(f):
+    """인덱스 항목 → API 응답용 파일 정보"""
+    return {
+        "name": f["name"],
+        "size": f["size"],
+        "modified": datetime.fromtimestamp(f["mtime"]).strftime("%m/%d %H:%M"),
+    }
+
+
+@metrics.timed("scan")
 def scan_collected_files(quarter=None):
     """부가세 수집된 파일 현황 스캔"""
     q_dir = get_quarter_dir(quarter)
+    groups = group_files(q_dir, [p["filename"] for p in PLATFORMS], VAT_EXTENSIONS)
     results = []
 
     for p in PLATFORMS:
-        files = []
-        if q_dir.exists():
-            for f in q_dir.iterdir():
-                if f.is_file() and f.suffix.lower() in ['.xlsx', '.xls', '.pdf', '.csv', '.zip']:
-                    if p["filename"] in f.name:
-                        files.append({
-                            "name": f.name,
-                            "size": f.stat().st_size,
-                            "modified": datetime.fromtimestamp(f.stat().st_mtime).strftime("%m/%d %H:%M"),
-                        })
-
+        files = [_file_info(f) for f in groups[p["filename"]]]
         results.append({
             **p,
             "collected": len(files) > 0,
@@ -360,23 +396,15 @@ def scan_collected_files(quarter=None):
     return results
 
 
+@metrics.timed("scan")
 def scan_corp_files(year=None):
     """법인세 수집된 파일 현황 스캔"""
     c_dir = get_corp_dir(year)
+    groups = group_files(c_dir, [i["filename"] for i in CORP_TAX_ITEMS], CORP_EXTENSIONS)
     results = []
 
     for item in CORP_TAX_ITEMS:
-        files = []
-        if c_dir.exists():
-            for f in c_dir.iterdir():
-                if f.is_file() and f.suffix.lower() in ['.xlsx', '.xls', '.pdf', '.csv', '.zip', '.jpg', '.jpeg', '.png', '.hwp', '.doc', '.docx']:
-                    if item["filename"] in f.name:
-                        files.append({
-                            "name": f.name,
-                            "size": f.stat().st_size,
-                            "modified": datetime.fromtimestamp(f.stat().st_mtime).strftime("%m/%d %H:%M"),
-                        })
-
+        files = [_file_info(f) for f in groups[item["filename"]]]
         results.append({
             **item,
             "collected": len(files) > 0,
@@ -386,6 +414,62 @@ def scan_corp_files(year=None):
     return results
 
 
+def upload_param(name, default):
+    """업로드 요청 파라미터 (PUT은 쿼리스트링, POST는 폼)"""
+    source = request.args if request.method == "PUT" else request.form
+    return source.get(name, default)
+
+
+def incoming_file():
+    """
+    업로드 요청에서 (원본 파일명, 입력 스트림) 추출.
+
+    - PUT: 요청 본문 전체가 파일, 파일명은 X-Filename 헤더(URL 인코딩) 또는 filename 파라미터
+    - POST: multipart 폼의 file 필드
+    파일이 없으면 (None, None).
+    """
+    if request.method == "PUT":
+        filename = unquote(request.headers.get("X-Filename", "")) or request.args.get("filename", "")
+        return filename, request.stream
+    if "file" not in request.files:
+        return None, None
+    file = request.files["file"]
+    return file.filename, file.stream
+
+
+def upload_response(saved, directory, label):
+    """저장 결과 → 업로드 API 응답 (중복이면 409 + 기존 파일명)"""
+    if saved["duplicate"]:
+        return jsonify({
+            "status": "error",
+            "message": f"이미 업로드된 파일입니다: {saved['path'].name}",
+            "duplicate": True,
+            "existing": saved["path"].name,
+        }), 409
+    invalidate_index(directory)
+    notify_changed(directory)
+
+    return jsonify({
+        "status": "success",
+        "message": f"{label} 파일 저장 완료",
+        "filename": saved["path"].name,
+        "size": saved["size"],
+        "sha256": saved["sha256"],
+    })
+
+
+def conditional_json(etag, last_modified, build):
+    """ETag가 일치하면 304, 아니면 build() 결과를 JSON으로 응답"""
+    if request.if_none_match.contains(etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = jsonify(build())
+    resp.set_etag(etag)
+    resp.last_modified = datetime.fromtimestamp(last_modified, timezone.utc)
+    resp.cache_control.no_cache = True
+    return resp
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Flask 라우트
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -399,6 +483,7 @@ def index():
         company_name=cfg["company_name"],
         accountant_name=cfg["accountant_name"],
         accountant_method=cfg["accountant_method"],
+        max_upload_bytes=app.config["MAX_CONTENT_LENGTH"],
     )
 
 
@@ -406,22 +491,26 @@ def index():
 def api_status():
     """수집 현황 API"""
     quarter = request.args.get("quarter", CURRENT_QUARTER or get_current_quarter())
-    platforms = scan_collected_files(quarter)
-    collected = sum(1 for p in platforms if p["collected"])
+    token, last_modified = index_version(get_quarter_dir(quarter))
 
-    return jsonify({
-        "quarter": quarter,
-        "platforms": platforms,
-        "collected": collected,
-        "total": len(PLATFORMS),
-        "complete": collected == len(PLATFORMS),
-    })
+    def build():
+        platforms = scan_collected_files(quarter)
+        collected = sum(1 for p in platforms if p["collected"])
+        return {
+            "quarter": quarter,
+            "platforms": platforms,
+            "collected": collected,
+            "total": len(PLATFORMS),
+            "complete": collected == len(PLATFORMS),
+        }
+
+    return conditional_json(f"{quarter}-{token}", last_modified, build)
 
 
-@app.route("/api/upload/<platform_id>", methods=["POST"])
+@app.route("/api/upload/<platform_id>", methods=["POST", "PUT"])
 def api_upload(platform_id):
-    """파일 업로드 (드래그&드롭)"""
-    quarter = request.form.get("quarter", CURRENT_QUARTER or get_current_quarter())
+    """파일 업로드 (드래그&드롭) — POST: multipart 폼, PUT: 요청 본문 스트리밍"""
+    quarter = upload_param("quarter", CURRENT_QUARTER or get_current_quarter())
     q_dir = get_quarter_dir(quarter)
 
     # 플랫폼 찾기
@@ -429,42 +518,26 @@ def api_upload(platform_id):
     if not platform:
         return jsonify({"status": "error", "message": "알 수 없는 플랫폼"}), 400
 
-    if "file" not in request.files:
+    filename, stream = incoming_file()
+    if stream is None:
         return jsonify({"status": "error", "message": "파일이 없습니다"}), 400
 
-    file = request.files["file"]
-    if file.filename == "":
+    if filename == "":
         return jsonify({"status": "error", "message": "파일명이 비어있습니다"}), 400
 
     # 확장자 확인
-    ext = Path(file.filename).suffix.lower()
-    allowed = ['.xlsx', '.xls', '.pdf', '.csv', '.zip']
+    ext = Path(filename).suffix.lower()
+    allowed = VAT_EXTENSIONS
     if ext not in allowed:
         return jsonify({
             "status": "error",
             "message": f"지원하지 않는 형식: {ext} (허용: {', '.join(allowed)})"
         }), 400
 
-    # 저장: {플랫폼명}_{원본파일명} (복수 파일 지원)
-    original_name = Path(file.filename).stem
-    save_name = f"{platform['filename']}_{original_name}{ext}"
-    save_path = q_dir / save_name
-
-    # 동일 파일명 존재 시 번호 부여
-    counter = 1
-    while save_path.exists():
-        save_name = f"{platform['filename']}_{original_name}_{counter}{ext}"
-        save_path = q_dir / save_name
-        counter += 1
-
-    file.save(str(save_path))
-
-    return jsonify({
-        "status": "success",
-        "message": f"{platform['name']} 파일 저장 완료",
-        "filename": save_name,
-        "size": save_path.stat().st_size,
-    })
+    # 저장: {플랫폼명}_{원본파일명} (복수 파일 지원, 동일 파일명 존재 시 번호 부여)
+    saved = save_stream(stream, q_dir, platform["filename"], Path(filename).stem, ext,
+                        max_size=app.config["MAX_CONTENT_LENGTH"])
+    return upload_response(saved, q_dir, platform["name"])
 
 
 @app.route("/api/delete/<platform_id>", methods=["DELETE"])
@@ -478,13 +551,16 @@ def api_delete(platform_id):
     if not platform:
         return jsonify({"status": "error", "message": "알 수 없는 플랫폼"}), 400
 
+    # 인덱스 목록 기준 — 진행 중인 업로드 임시파일(.part)은 건드리지 않음
     deleted = []
-    for f in q_dir.iterdir():
-        if f.is_file() and platform["filename"] in f.name:
-            if target_file and f.name != target_file:
+    for f in list_files(q_dir):
+        if platform["filename"] in f["name"]:
+            if target_file and f["name"] != target_file:
                 continue
-            f.unlink()
-            deleted.append(f.name)
+            (q_dir / f["name"]).unlink(missing_ok=True)
+            deleted.append(f["name"])
+    invalidate_index(q_dir)
+    notify_changed(q_dir)
 
     return jsonify({
         "status": "success",
@@ -512,27 +588,39 @@ def api_open_platform(platform_id):
     })
 
 
-@app.route("/api/package", methods=["POST"])
-def api_create_package():
-    """세무사 전달 패키지 생성"""
-    quarter = request.form.get("quarter", CURRENT_QUARTER or get_current_quarter())
-    q_dir = get_quarter_dir(quarter)
+# 패키지 산출물 캐시: 분기 → (키, 응답, 산출물 경로)
+# 키 = 분기 폴더 파일 구성 + 설정 내용 + 작성일 — 그대로면 체크리스트·카톡 메시지를 다시 만들지 않음
+# 잠금은 분기별 — 한 분기를 만드는 동안 다른 분기의 캐시 응답은 기다리지 않음
+_package_cache = {}
+_package_locks = defaultdict(threading.Lock)
+
 
-    # 수집 현황 체크
+@metrics.timed("package", "vat_package")
+def build_vat_package(quarter):
+    """
+    부가세 전달 패키지 생성 — 분기 폴더 인덱스를 현황·카톡 메시지가 공유 (폴더 재스캔 없음).
+
+    Returns:
+        tuple: (API 응답 dict, 산출물 경로 목록 — 생성 실패 시 빈 목록)
+    """
     platforms = scan_collected_files(quarter)
     collected = [p for p in platforms if p["collected"]]
     missing = [p for p in platforms if not p["collected"]]
 
     # tax_package.py의 기능 호출
     try:
-        from tax_package import create_vat_checklist, create_kakao_message
+        from tax_package import MESSAGE_EXTENSIONS, create_vat_checklist, create_kakao_message
+        file_names = [f["name"] for f in list_files(get_quarter_dir(quarter))
+                      if Path(f["name"]).suffix in MESSAGE_EXTENSIONS]
         checklist_path = create_vat_checklist(quarter)
-        kakao_path, kakao_text = create_kakao_message("vat", quarter)
+        kakao_path, kakao_text = create_kakao_message("vat", quarter, file_names)
+        outputs = [checklist_path, kakao_path]
     except Exception as e:
         checklist_path = None
         kakao_text = f"[오류] 패키지 생성 실패: {e}"
+        outputs = []
 
-    return jsonify({
+    return {
         "status": "success",
         "quarter": quarter,
         "collected": len(collected),
@@ -543,7 +631,66 @@ def api_create_package():
             {"platform": p["name"], "files": [f["name"] for f in p["files"]]}
             for p in collected
         ],
-    })
+    }, outputs
+
+
+@app.route("/api/package", methods=["POST"])
+def api_create_package():
+    """세무사 전달 패키지 생성 (파일·설정이 그대로면 이전 산출물 재사용)"""
+    quarter = request.form.get("quarter", CURRENT_QUARTER or get_current_quarter())
+    q_dir = get_quarter_dir(quarter)
+    # 스캔 전에 키를 잡아야 스캔 도중 바뀐 파일이 이전 키로 저장되지 않음
+    key = (index_version(q_dir), config_version(), datetime.now().strftime("%Y-%m-%d"))
+
+    with _package_locks[quarter]:
+        cached = _package_cache.get(quarter)
+        if cached and cached[0] == key and all(Path(p).exists() for p in cached[2]):
+            return jsonify({**cached[1], "cached": True})
+        result, outputs = build_vat_package(quarter)
+        if outputs:
+            _package_cache[quarter] = (key, result, outputs)
+    return jsonify({**result, "cached": False})
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 부가세 셀프 체크 API (백그라운드 작업)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@app.errorhandler(vat_jobs.JobError)
+def handle_job_error(e):
+    return jsonify({"status": "error", "message": str(e)}), e.status
+
+
+@app.route("/api/vat-check", methods=["POST"])
+def api_vat_check_submit():
+    """
+    이카운트↔홈택스 대조 작업 등록 — 진행 상황은 /api/events (event: job) 또는 폴링으로 확인.
+    form: quarter, mode ("partner"|"invoice")
+    """
+    quarter = request.form.get("quarter", CURRENT_QUARTER or get_current_quarter())
+    mode = request.form.get("mode", "partner")
+    job, created = vat_jobs.submit(quarter, mode)
+    return jsonify({"status": "success", **job, "new_job": created}), 202 if created else 200
+
+
+@app.route("/api/vat-check")
+def api_vat_check_latest():
+    """분기의 가장 최근 대조 작업 (없으면 job_id: null)"""
+    quarter = request.args.get("quarter", CURRENT_QUARTER or get_current_quarter())
+    job = vat_jobs.latest(quarter)
+    return jsonify({"status": "success", **(job or {"job_id": None, "quarter": quarter})})
+
+
+@app.route("/api/vat-check/<job_id>")
+def api_vat_check_status(job_id):
+    """대조 작업 상태·결과 요약"""
+    return jsonify({"status": "success", **vat_jobs.get(job_id)})
+
+
+@app.route("/api/vat-check/<job_id>/download")
+def api_vat_check_download(job_id):
+    """대조 리포트 엑셀 다운로드"""
+    path = vat_jobs.report_path(job_id)
+    return send_file(path, as_attachment=True, download_name=path.name)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -555,72 +702,64 @@ def api_corp_status():
     cfg = load_config()
     corp_tax_info = get_corp_tax_info(cfg)
     year = request.args.get("year", str(corp_tax_info["year"]))
-    items = scan_corp_files(year)
-    required_items = [i for i in items if i["category"] == "required"]
-    optional_items = [i for i in items if i["category"] == "optional"]
-    req_collected = sum(1 for i in required_items if i["collected"])
-    opt_collected = sum(1 for i in optional_items if i["collected"])
-
-    return jsonify({
-        "year": year,
-        "info": corp_tax_info,
-        "items": items,
-        "required_collected": req_collected,
-        "required_total": len(required_items),
-        "optional_collected": opt_collected,
-        "optional_total": len(optional_items),
-        "total_collected": req_collected + opt_collected,
-        "total": len(CORP_TAX_ITEMS),
-    })
-
-
-@app.route("/api/corp/upload/<item_id>", methods=["POST"])
+    token, last_modified = index_version(get_corp_dir(year))
+    # 신고 정보(config)가 바뀌어도 응답이 달라지므로 토큰에 포함
+    info_hash = hashlib.sha1(
+        json.dumps(corp_tax_info, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()[:8]
+
+    def build():
+        items = scan_corp_files(year)
+        required_items = [i for i in items if i["category"] == "required"]
+        optional_items = [i for i in items if i["category"] == "optional"]
+        req_collected = sum(1 for i in required_items if i["collected"])
+        opt_collected = sum(1 for i in optional_items if i["collected"])
+        return {
+            "year": year,
+            "info": corp_tax_info,
+            "items": items,
+            "required_collected": req_collected,
+            "required_total": len(required_items),
+            "optional_collected": opt_collected,
+            "optional_total": len(optional_items),
+            "total_collected": req_collected + opt_collected,
+            "total": len(CORP_TAX_ITEMS),
+        }
+
+    return conditional_json(f"{year}-{info_hash}-{token}", last_modified, build)
+
+
+@app.route("/api/corp/upload/<item_id>", methods=["POST", "PUT"])
 def api_corp_upload(item_id):
-    """법인세 파일 업로드"""
+    """법인세 파일 업로드 — POST: multipart 폼, PUT: 요청 본문 스트리밍"""
     cfg = load_config()
     corp_tax_info = get_corp_tax_info(cfg)
-    year = request.form.get("year", str(corp_tax_info["year"]))
+    year = upload_param("year", str(corp_tax_info["year"]))
     c_dir = get_corp_dir(year)
 
     item = next((i for i in CORP_TAX_ITEMS if i["id"] == item_id), None)
     if not item:
         return jsonify({"status": "error", "message": "알 수 없는 항목"}), 400
 
-    if "file" not in request.files:
+    filename, stream = incoming_file()
+    if stream is None:
         return jsonify({"status": "error", "message": "파일이 없습니다"}), 400
 
-    file = request.files["file"]
-    if file.filename == "":
+    if filename == "":
         return jsonify({"status": "error", "message": "파일명이 비어있습니다"}), 400
 
-    ext = Path(file.filename).suffix.lower()
-    allowed = ['.xlsx', '.xls', '.pdf', '.csv', '.zip', '.jpg', '.jpeg', '.png', '.hwp', '.doc', '.docx']
+    ext = Path(filename).suffix.lower()
+    allowed = CORP_EXTENSIONS
     if ext not in allowed:
         return jsonify({
             "status": "error",
             "message": f"지원하지 않는 형식: {ext}"
         }), 400
 
-    # 저장: {항목명}_{원본파일명} (복수 파일 지원)
-    original_name = Path(file.filename).stem
-    save_name = f"{item['filename']}_{original_name}{ext}"
-    save_path = c_dir / save_name
-
-    # 동일 파일명 존재 시 번호 부여
-    counter = 1
-    while save_path.exists():
-        save_name = f"{item['filename']}_{original_name}_{counter}{ext}"
-        save_path = c_dir / save_name
-        counter += 1
-
-    file.save(str(save_path))
-
-    return jsonify({
-        "status": "success",
-        "message": f"{item['name']} 파일 저장 완료",
-        "filename": save_name,
-        "size": save_path.stat().st_size,
-    })
+    # 저장: {항목명}_{원본파일명} (복수 파일 지원, 동일 파일명 존재 시 번호 부여)
+    saved = save_stream(stream, c_dir, item["filename"], Path(filename).stem, ext,
+                        max_size=app.config["MAX_CONTENT_LENGTH"])
+    return upload_response(saved, c_dir, item["name"])
 
 
 @app.route("/api/corp/delete/<item_id>", methods=["DELETE"])
@@ -636,13 +775,16 @@ def api_corp_delete(item_id):
     if not item:
         return jsonify({"status": "error", "message": "알 수 없는 항목"}), 400
 
+    # 인덱스 목록 기준 — 진행 중인 업로드 임시파일(.part)은 건드리지 않음
     deleted = []
-    for f in c_dir.iterdir():
-        if f.is_file() and item["filename"] in f.name:
-            if target_file and f.name != target_file:
+    for f in list_files(c_dir):
+        if item["filename"] in f["name"]:
+            if target_file and f["name"] != target_file:
                 continue
-            f.unlink()
-            deleted.append(f.name)
+            (c_dir / f["name"]).unlink(missing_ok=True)
+            deleted.append(f["name"])
+    invalidate_index(c_dir)
+    notify_changed(c_dir)
 
     return jsonify({
         "status": "success",
@@ -652,6 +794,7 @@ def api_corp_delete(item_id):
 
 
 @app.route("/api/corp/package", methods=["POST"])
+@metrics.timed("package", "corp_package")
 def api_corp_package():
     """법인세 세무사 전달 패키지"""
     cfg = load_config()
@@ -713,6 +856,213 @@ def api_corp_package():
     })
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 이어받기 업로드 API (대용량 파일)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def upload_target(kind, target_id, period=None):
+    """업로드 대상 → (저장 폴더, 파일명 접두어, 표시명, 허용 확장자). 없으면 None"""
+    if kind == "vat":
+        platform = next((p for p in PLATFORMS if p["id"] == target_id), None)
+        if platform:
+            q_dir = get_quarter_dir(period or CURRENT_QUARTER or get_current_quarter())
+            return q_dir, platform["filename"], platform["name"], VAT_EXTENSIONS
+    elif kind == "corp":
+        item = next((i for i in CORP_TAX_ITEMS if i["id"] == target_id), None)
+        if item:
+            return get_corp_dir(period), item["filename"], item["name"], CORP_EXTENSIONS
+    return None
+
+
+@app.errorhandler(resumable.SessionError)
+def handle_session_error(e):
+    return jsonify({"status": "error", "message": str(e)}), 400
+
+
+@app.route("/api/upload-sessions", methods=["POST"])
+def api_upload_session_create():
+    """
+    이어받기 업로드 시작.
+    JSON: {type: "vat"|"corp", id: 플랫폼/항목 ID, period: 분기/연도, filename, size}
+    """
+    body = request.get_json(silent=True) or {}
+    target = upload_target(body.get("type"), body.get("id"), body.get("period"))
+    if not target:
+        return jsonify({"status": "error", "message": "알 수 없는 업로드 대상"}), 400
+    directory, prefix, label, allowed = target
+
+    filename = body.get("filename") or ""
+    if filename == "":
+        return jsonify({"status": "error", "message": "파일명이 비어있습니다"}), 400
+
+    ext = Path(filename).suffix.lower()
+    if ext not in allowed:
+        return jsonify({
+            "status": "error",
+            "message": f"지원하지 않는 형식: {ext} (허용: {', '.join(allowed)})"
+        }), 400
+
+    size = body.get("size")
+    if not isinstance(size, int) or size < 0:
+        return jsonify({"status": "error", "message": "파일 크기가 올바르지 않습니다"}), 400
+    if size > app.config["MAX_CONTENT_LENGTH"]:
+        raise RequestEntityTooLarge()
+
+    session = resumable.create(directory, prefix, Path(filename).stem, ext, filename, size, label)
+    return jsonify({"status": "success", **resumable.public(session)})
+
+
+@app.route("/api/upload-sessions/<session_id>", methods=["GET"])
+def api_upload_session_status(session_id):
+    """이어받기 상태 (받은 구간 목록)"""
+    return jsonify({"status": "success", **resumable.public(resumable.get(session_id))})
+
+
+@app.route("/api/upload-sessions/<session_id>", methods=["PUT"])
+def api_upload_session_chunk(session_id):
+    """청크 업로드 — ?offset=N, 본문은 청크 바이트"""
+    offset = request.args.get("offset", type=int)
+    if offset is None:
+        return jsonify({"status": "error", "message": "offset이 없습니다"}), 400
+    session = resumable.write(session_id, offset, request.stream, request.content_length)
+    return jsonify({"status": "success", **resumable.public(session)})
+
+
+@app.route("/api/upload-sessions/<session_id>", methods=["DELETE"])
+def api_upload_session_abort(session_id):
+    """이어받기 업로드 취소"""
+    resumable.abort(session_id)
+    return jsonify({"status": "success", "message": "업로드 취소"})
+
+
+@app.route("/api/upload-sessions/<session_id>/finalize", methods=["POST"])
+def api_upload_session_finalize(session_id):
+    """모든 청크 수신 후 저장 확정"""
+    session = resumable.get(session_id)
+    saved = resumable.finalize(session_id)
+    return upload_response(saved, Path(session["directory"]), session["label"])
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 일괄 업로드 API (파일명으로 플랫폼/항목 자동 분류)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def classify_upload(filename, kinds=("vat", "corp")):
+    """
+    파일명으로 업로드 대상 추정 (가장 긴 키워드가 일치하는 대상 우선).
+
+    Returns:
+        tuple: ("vat"|"corp", 플랫폼/항목 dict) — 일치 없으면 (None, None)
+    """
+    name = filename.replace(" ", "").lower()
+    best_len, best = 0, (None, None)
+    for kind in kinds:
+        targets = PLATFORMS if kind == "vat" else CORP_TAX_ITEMS
+        for t in targets:
+            keywords = [t["filename"], t["name"].replace(" ", "")]
+            if kind == "vat":
+                keywords.append(t["id"])
+            for kw in keywords:
+                if kw.lower() in name and len(kw) > best_len:
+                    best_len, best = len(kw), (kind, t)
+    return best
+
+
+@app.route("/api/upload-batch", methods=["POST"])
+def api_upload_batch():
+    """
+    여러 파일 일괄 업로드 — ZIP은 풀어서 항목별로 저장.
+    폼: files (복수), type ("vat"|"corp", 없으면 둘 다), quarter, year, expand_zip (기본 1)
+
+    MAX_CONTENT_LENGTH는 요청 전체에 걸리므로 대시보드는 합계가 한도를 넘지 않게
+    여러 요청으로 나눠 보냄 (한도를 넘는 단일 파일은 보내기 전에 거부).
+    """
+    kind = request.form.get("type")
+    kinds = (kind,) if kind in ("vat", "corp") else ("vat", "corp")
+    quarter = request.form.get("quarter", CURRENT_QUARTER or get_current_quarter())
+    year = request.form.get("year") or str(load_config()["corp_tax_year"])
+    expand_zip = request.form.get("expand_zip", "1") != "0"
+    allowed = {"vat": VAT_EXTENSIONS, "corp": CORP_EXTENSIONS}
+    max_size = app.config["MAX_CONTENT_LENGTH"]
+
+    dirs = {}
+    touched = set()
+    result = {"saved": [], "duplicates": [], "unmatched": [], "rejected": []}
+
+    def store(name, stream, source, fallback=(None, None)):
+        kind_, target = classify_upload(name, kinds)
+        if target is None:
+            kind_, target = fallback
+        if target is None:
+            result["unmatched"].append(source)
+            return
+
+        ext = Path(name).suffix.lower()
+        if ext not in allowed[kind_]:
+            result["rejected"].append({"source": source, "message": f"지원하지 않는 형식: {ext}"})
+            return
+
+        if kind_ not in dirs:
+            dirs[kind_] = get_quarter_dir(quarter) if kind_ == "vat" else get_corp_dir(year)
+        directory = dirs[kind_]
+        try:
+            saved = save_stream(stream, directory, target["filename"], Path(name).stem, ext, max_size)
+        except RequestEntityTooLarge:
+            result["rejected"].append({"source": source, "message": "파일이 너무 큽니다"})
+            return
+
+        entry = {"source": source, "type": kind_, "id": target["id"], "name": target["name"],
+                 "size": saved["size"]}
+        if saved["duplicate"]:
+            result["duplicates"].append({**entry, "existing": saved["path"].name})
+        else:
+            result["saved"].append({**entry, "filename": saved["path"].name})
+            touched.add(directory)
+
+    for file in request.files.getlist("files"):
+        if not file.filename:
+            continue
+        if expand_zip and Path(file.filename).suffix.lower() == ".zip":
+            # ZIP 항목은 항목 파일명으로 분류, 안 되면 ZIP 파일명 기준
+            zip_target = classify_upload(file.filename, kinds)
+            try:
+                for member, stream in iter_zip_members(file.stream):
+                    store(member, stream, f"{file.filename}/{member}", zip_target)
+            except zipfile.BadZipFile:
+                result["rejected"].append({"source": file.filename, "message": "ZIP 파일을 열 수 없습니다"})
+        else:
+            store(file.filename, file.stream, file.filename)
+
+    for directory in touched:
+        invalidate_index(directory)
+        notify_changed(directory)
+
+    parts = [f"{len(result['saved'])}개 저장"]
+    if result["duplicates"]:
+        parts.append(f"중복 {len(result['duplicates'])}개")
+    if result["unmatched"]:
+        parts.append(f"분류 실패 {len(result['unmatched'])}개")
+    if result["rejected"]:
+        parts.append(f"거부 {len(result['rejected'])}개")
+
+    return jsonify({
+        "status": "success",
+        "message": ", ".join(parts),
+        "quarter": quarter,
+        "year": year,
+        **result,
+    })
+
+
+@app.route("/api/events")
+def api_events():
+    """파일 추가/삭제 변경 피드 (Server-Sent Events)"""
+    q = subscribe()
+    return Response(
+        stream_with_context(stream(q)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/api/quarters")
 def api_quarters():
     """사용 가능한 분기 목록"""
@@ -741,12 +1091,32 @@ def main():
     parser.add_argument("--port", type=int, default=None, help="서버 포트")
     parser.add_argument("--debug", action="store_true", help="디버그 모드")
     parser.add_argument("--setup", action="store_true", help="설정 마법사 실행")
+    parser.add_argument("--serve", action="store_true", help="운영 서버(waitress, 멀티스레드)로 실행")
+    parser.add_argument("--threads", type=int, default=16,
+                        help="--serve 작업 스레드 수 (열린 대시보드 탭마다 실시간 알림 연결 1개 사용)")
+    parser.add_argument("--timeout", type=int, default=120,
+                        help="--serve 유휴 연결(keep-alive·멈춘 요청) 종료 시간 (초)")
+    parser.add_argument("--connection-limit", type=int, default=100, help="--serve 최대 동시 연결 수")
+    parser.add_argument("--no-browser", action="store_true", help="시작 시 브라우저를 열지 않음")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="시작 시 모듈별 import 시간과 지연 로딩 모듈의 첫 사용 비용을 출력하고 종료")
+    parser.add_argument("--metrics", action="store_true",
+                        help="요청·내부 작업 시간 계측 (/api/metrics, Server-Timing 헤더)")
     args = parser.parse_args()
 
+    if args.import_profile:
+        print_import_profile()
+        return
+
     # 설정 마법사 (--setup 또는 첫 실행)
     if args.setup or not is_configured():
         run_setup_wizard()
 
+    if args.metrics:
+        metrics.enable()
+        metrics.init_app(app)
+
+    start_config_watcher()  # config_local.json 직접 수정 시 자동 반영
     cfg = load_config()
     corp_tax_info = get_corp_tax_info(cfg)
 
@@ -759,6 +1129,8 @@ def main():
     print(f"  부가세: {CURRENT_QUARTER}")
     print(f"  법인세: {corp_tax_info['year']}년 귀속 (제출기한: {corp_tax_info['submission_deadline']})")
     print(f"  URL:  http://localhost:{port}")
+    if metrics.enabled():
+        print(f"  계측: http://localhost:{port}/api/metrics")
     print("=" * 50)
 
     # 부가세 현황
@@ -780,16 +1152,71 @@ def main():
 
     print(f"\n  브라우저에서 http://localhost:{port} 접속하세요.\n")
 
-    # 브라우저 자동 열기 (2초 후)
-    if not args.debug:
+    # 브라우저 자동 열기 (서버가 접속을 받기 시작하면 바로, 최대 10초 대기)
+    if not args.debug and not args.no_browser:
         def open_browser():
             import time
-            time.sleep(2)
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                try:
+                    with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                        break
+                except OSError:
+                    time.sleep(0.05)
             webbrowser.open(f"http://localhost:{port}")
         threading.Thread(target=open_browser, daemon=True).start()
 
-    app.run(host="0.0.0.0", port=port, debug=args.debug)
+    if args.serve:
+        serve_production(port, args.threads, args.timeout, args.connection_limit)
+    else:
+        app.run(host="0.0.0.0", port=port, debug=args.debug)
+
+
+# 기능을 처음 쓸 때 불러오는 모듈 (시작 시 import하지 않음)
+LAZY_MODULES = [
+    ("tax_package", "세무사 전달 패키지"),
+    ("vat_checker", "부가세 셀프 체크"),
+    ("platform_opener", "Playwright 셀러센터 오픈 (선택)"),
+]
+
+
+def print_import_profile():
+    """--import-profile: 시작 시 import 시간 + 지연 로딩 모듈 첫 사용 비용"""
+    import import_profile
+
+    print("=" * 50)
+    print("  시작 시 import (대시보드 첫 화면 전)")
+    print("=" * 50)
+    import_profile.report()
+
+    print(f"\n  기능 첫 사용 시 import (지연 로딩)")
+    for name, label in LAZY_MODULES:
+        elapsed = import_profile.measure(name)
+        cost = "미설치" if elapsed < 0 else f"{elapsed * 1000:,.0f}ms"
+        print(f"  {cost:>9}  {name:16s} {label}")
+
+
+def serve_production(port, threads, timeout, connection_limit):
+    """waitress(순수 Python 멀티스레드 WSGI 서버)로 실행 — PyInstaller 번들에서도 동작"""
+    try:
+        from waitress import serve
+    except ImportError:
+        print("waitress가 설치되어 있지 않습니다.")
+        print("  pip install waitress")
+        raise SystemExit(1)
+
+    print(f"  운영 서버: 스레드 {threads}개 · 유휴 연결 {timeout}초 후 종료 · 최대 연결 {connection_limit}개\n")
+    serve(
+        app,
+        host="0.0.0.0",
+        port=port,
+        threads=threads,
+        channel_timeout=timeout,
+        connection_limit=connection_limit,
+        ident="tax-dashboard",
+    )
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # PyInstaller 번들에서 부가세 체크 프로세스 풀 사용
     main()
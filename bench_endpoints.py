@@ -0,0 +1,326 @@
+"""
+대시보드 API 벤치마크 (합성 입력 폴더)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+input/{분기}와 input/법인세_{연도}에 플랫폼·항목별로 파일을 N개씩 만들어 두고
+주요 API를 동시 요청 수별로 호출해 지연시간(p50/p95/p99)과 처리량을 잽니다.
+자료가 쌓일수록 현황 스캔·패키지 생성이 얼마나 느려지는지 확인하는 용도입니다.
+
+- client: Flask test client (네트워크 없이 앱 코드만)
+- server: 실제 멀티스레드 서버 (app.py --serve, waitress) + HTTP keep-alive 연결
+- 첫 요청(first_ms)은 따로 기록 — 폴더 첫 스캔·패키지 첫 생성 비용
+
+매 실행은 임시 폴더의 복사본에서 돌아가므로 실제 input/·설정에 영향이 없습니다.
+
+사용법:
+    python bench_endpoints.py                                   (100·1000개, 동시 1·8·32)
+    python bench_endpoints.py --files 100 10000 100000 --concurrency 1 16 --requests 500
+    python bench_endpoints.py --modes server --threads 32 --output after.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+from bench_startup import BENCH_CONFIG, free_port, prepare_source, stop
+
+BASE_DIR = Path(__file__).parent
+QUARTER = "2026Q1"       # 파일을 채울 분기
+UPLOAD_QUARTER = QUARTER  # 업로드도 같은 (큰) 폴더로 — 중복 확인·이름 결정 비용 포함
+CORP_YEAR = "2025"
+EXTRA_QUARTERS = 8       # /api/quarters용 빈 분기 폴더 수
+RESULT_PREFIX = "RESULT "
+
+# 측정 순서 — 업로드는 폴더를 바꾸므로 마지막
+ENDPOINTS = ["status", "status_304", "corp_status", "quarters", "package", "upload"]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 1. 합성 입력 폴더
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def generate_tree(root: Path, files_per_item: int):
+    """플랫폼·법인세 항목마다 files_per_item개 파일 생성 (내용은 짧은 더미)."""
+    from app import CORP_TAX_ITEMS, PLATFORMS
+
+    input_dir = root / "input"
+    vat_dir = input_dir / QUARTER
+    corp_dir = input_dir / f"법인세_{CORP_YEAR}"
+    for d in [vat_dir, corp_dir]:
+        d.mkdir(parents=True, exist_ok=True)
+    for i in range(EXTRA_QUARTERS):
+        (input_dir / f"{2024 + i // 4}Q{i % 4 + 1}").mkdir(exist_ok=True)
+
+    def fill(directory, prefixes, ext):
+        for prefix in prefixes:
+            for n in range(files_per_item):
+                fd = os.open(directory / f"{prefix}_{n:06d}{ext}", os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+                os.write(fd, f"{prefix} {n}".encode("utf-8"))
+                os.close(fd)
+
+    fill(vat_dir, [p["filename"] for p in PLATFORMS], ".xlsx")
+    fill(corp_dir, [i["filename"] for i in CORP_TAX_ITEMS], ".pdf")
+
+
+def request_spec(name: str, etag: str = None):
+    """엔드포인트 이름 → (method, path, headers, body 생성 함수, 기대 상태)"""
+    if name == "status":
+        return "GET", f"/api/status?quarter={QUARTER}", {}, None, 200
+    if name == "status_304":
+        return "GET", f"/api/status?quarter={QUARTER}", {"If-None-Match": etag or ""}, None, 304
+    if name == "corp_status":
+        return "GET", f"/api/corp/status?year={CORP_YEAR}", {}, None, 200
+    if name == "quarters":
+        return "GET", "/api/quarters", {}, None, 200
+    if name == "package":
+        body = f"quarter={QUARTER}".encode()
+        return "POST", "/api/package", {"Content-Type": "application/x-www-form-urlencoded"}, lambda: body, 200
+    if name == "upload":
+        # 매번 내용이 달라야 중복 업로드(409)로 걸러지지 않음
+        headers = {"X-Filename": quote("bench.xlsx"), "Content-Type": "application/octet-stream"}
+        return ("PUT", f"/api/upload/coupang?quarter={UPLOAD_QUARTER}", headers,
+                lambda: f"bench {uuid.uuid4().hex}".encode(), 200)
+    raise ValueError(name)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 2. 부하 실행
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def summarize(latencies: list, elapsed: float, errors: int) -> dict:
+    ms = sorted(v * 1000 for v in latencies)
+    if len(ms) >= 2:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else None
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "p50_ms": round(p50, 2) if p50 is not None else None,
+        "p95_ms": round(p95, 2) if p95 is not None else None,
+        "p99_ms": round(p99, 2) if p99 is not None else None,
+        "max_ms": round(ms[-1], 2) if ms else None,
+        "rps": round(len(ms) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def run_load(make_sender, spec, total: int, concurrency: int) -> dict:
+    """
+    total번 요청을 concurrency개 스레드로 나눠 보냄.
+    make_sender()는 스레드마다 하나씩 만드는 send(method, path, headers, body) → status 함수.
+    """
+    method, path, headers, body, expected = spec
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker():
+        send = make_sender()
+        local, local_errors = [], 0
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    break
+            payload = body() if body else None
+            start = time.perf_counter()
+            status = send(method, path, headers, payload)
+            local.append(time.perf_counter() - start)
+            if status != expected:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+def bench_endpoints(make_sender, endpoints, concurrency_levels, total) -> list:
+    """엔드포인트 × 동시 요청 수 측정 (엔드포인트마다 첫 요청은 따로)."""
+    send = make_sender()
+    rows = []
+    for name in endpoints:
+        etag = None
+        if name == "status_304":
+            # 대시보드 폴링과 같이 이전 응답의 ETag로 조건부 요청
+            method, path, headers, _, _ = request_spec("status")
+            send(method, path, headers, None)
+            etag = send.last_headers.get("ETag")
+        spec = request_spec(name, etag)
+        method, path, headers, body, expected = spec
+        start = time.perf_counter()
+        status = send(method, path, headers, body() if body else None)
+        first_ms = round((time.perf_counter() - start) * 1000, 2)
+        if status != expected:
+            print(f"  ⚠️ {name}: 상태 {status} (기대 {expected})")
+        for concurrency in concurrency_levels:
+            row = {"endpoint": name, "concurrency": concurrency, "first_ms": first_ms,
+                   **run_load(make_sender, spec, total, concurrency)}
+            rows.append(row)
+            print(f"  {name:12s} 동시 {concurrency:3d}  p50 {row['p50_ms']:8.2f}ms  p95 {row['p95_ms']:8.2f}ms  "
+                  f"p99 {row['p99_ms']:8.2f}ms  {row['rps']:8.1f} req/s  (첫 요청 {first_ms:.1f}ms"
+                  f"{', 오류 ' + str(row['errors']) if row['errors'] else ''})")
+    return rows
+
+
+def client_sender_factory(app):
+    """Flask test client — 스레드마다 클라이언트 하나."""
+    def make_sender():
+        client = app.test_client()
+
+        def send(method, path, headers, body):
+            resp = client.open(path, method=method, headers=headers, data=body)
+            send.last_headers = resp.headers
+            return resp.status_code
+
+        send.last_headers = {}
+        return send
+    return make_sender
+
+
+def server_sender_factory(port: int):
+    """실제 HTTP 연결 — 스레드마다 keep-alive 연결 하나 (끊기면 다시 연결)."""
+    def make_sender():
+        state = {"conn": None}
+
+        def send(method, path, headers, body):
+            for attempt in range(2):
+                if state["conn"] is None:
+                    state["conn"] = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+                try:
+                    state["conn"].request(method, path, body=body, headers=headers)
+                    resp = state["conn"].getresponse()
+                    resp.read()
+                    send.last_headers = resp.headers  # 대소문자 구분 없는 헤더
+                    return resp.status
+                except (http.client.HTTPException, OSError):
+                    state["conn"].close()
+                    state["conn"] = None
+                    if attempt:
+                        return None
+
+        send.last_headers = {}
+        return send
+    return make_sender
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 3. 모드별 실행
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def run_client_worker(args):
+    """(하위 프로세스) 임시 복사본의 app을 불러와 test client로 측정 → 결과 JSON 출력."""
+    sys.path.insert(0, str(args.worker_root))
+    os.chdir(args.worker_root)
+    import app as dashboard
+
+    rows = bench_endpoints(client_sender_factory(dashboard.app), args.endpoints, args.concurrency, args.requests)
+    print(RESULT_PREFIX + json.dumps(rows, ensure_ascii=False))
+
+
+def run_client(root: Path, args) -> list:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--worker-root", str(root),
+           "--requests", str(args.requests), "--concurrency", *map(str, args.concurrency),
+           "--endpoints", *args.endpoints]
+    proc = subprocess.run(cmd, cwd=root, capture_output=True, text=True, encoding="utf-8", errors="replace")
+    rows = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            rows = json.loads(line[len(RESULT_PREFIX):])
+        else:
+            print(line)
+    if rows is None:
+        raise RuntimeError(f"test client 측정 실패:\n{proc.stderr[-2000:]}")
+    return rows
+
+
+def run_server(root: Path, args) -> list:
+    port = free_port()
+    cmd = [sys.executable, "app.py", "--serve", "--threads", str(args.threads), "--port", str(port),
+           "--no-browser", "--connection-limit", str(max(100, max(args.concurrency) * 2))]
+    proc = subprocess.Popen(cmd, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            stdin=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"서버가 시작 중 종료됨 (exit {proc.returncode})")
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/api/quarters")
+                conn.getresponse().read()
+                conn.close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("서버 응답 없음")
+                time.sleep(0.05)
+        return bench_endpoints(server_sender_factory(port), args.endpoints, args.concurrency, args.requests)
+    finally:
+        stop(proc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 API 벤치마크 (합성 입력 폴더)")
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 1000],
+                        help="플랫폼·법인세 항목별 파일 수 (여러 개면 각각 측정)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="동시 요청 수")
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트·동시 요청 수별 요청 횟수")
+    parser.add_argument("--modes", nargs="+", choices=["client", "server"], default=["client", "server"])
+    parser.add_argument("--threads", type=int, default=16, help="server 모드 작업 스레드 수")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: output/bench_endpoints_시각.json)")
+    parser.add_argument("--worker-root", type=Path, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_root:
+        run_client_worker(args)
+        return
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "requests": args.requests,
+        "server_threads": args.threads,
+        "scenarios": [],
+    }
+
+    for files in args.files:
+        for mode in args.modes:
+            with tempfile.TemporaryDirectory(prefix="bench_endpoints_") as tmp:
+                root = prepare_source(Path(tmp))["cwd"]
+                (root / "config_local.json").write_text(
+                    json.dumps({**BENCH_CONFIG, "corp_tax_year": int(CORP_YEAR)}, ensure_ascii=False),
+                    encoding="utf-8",
+                )
+                started = time.perf_counter()
+                generate_tree(root, files)
+                print(f"\n▶ 파일 {files:,}개 × (플랫폼 8 + 법인세 항목) · {mode} "
+                      f"(생성 {time.perf_counter() - started:.1f}초)")
+                rows = run_client(root, args) if mode == "client" else run_server(root, args)
+            results["scenarios"].append({"files_per_item": files, "mode": mode, "results": rows})
+
+    output = Path(args.output) if args.output else (
+        BASE_DIR / "output" / f"bench_endpoints_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n📄 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+부가세 셀프 체크 대조 벤치마크 (합성 이카운트·홈택스 엑셀)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+이카운트 매출/매입장과 홈택스 세금계산서 목록을 N행씩 만들어 두고
+vat_checker의 단계별 시간과 최대 메모리를 잽니다.
+
+    load_excel → map_columns → compare_data (partner / invoice) → create_report
+
+생성 데이터:
+- 파일마다 헤더 이름·순서가 다름 (COLUMN_MAP 후보 여러 개 사용, 이카운트는 제목 행 포함)
+- 금액은 "1,234,000" / "1,234,000원" 문자열 또는 숫자, 사업자번호는 하이픈 유무 섞임
+- 홈택스 누락·이카운트 누락·공급가액 불일치를 정해진 비율로 주입하고,
+  대조 결과가 주입한 것과 정확히 같은지 확인 (다르면 종료 코드 1)
+
+메모리는 tracemalloc으로 단계별 최대 할당량을 따로 한 번 더 돌려서 잽니다
+(tracemalloc이 켜져 있으면 느려지므로 시간 측정과 분리, --no-memory로 생략).
+
+사용법:
+    python bench_reconcile.py                                    (1만·10만·100만 행)
+    python bench_reconcile.py --rows 10000 --modes invoice
+    python bench_reconcile.py --rows 1000000 --data-dir bench_data  (생성한 엑셀 재사용)
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from openpyxl import Workbook
+
+import vat_checker
+from excel_reader import CalamineWorkbook
+
+BASE_DIR = Path(__file__).parent
+QUARTER_START = date(2026, 1, 1)
+QUARTER_DAYS = 90
+
+# 파일별 레이아웃 — (제목 행, [(표준 이름, 헤더)], 금액 형식, 사업자번호 형식, 일자 형식)
+# 헤더 순서가 매핑에 영향을 주므로 (앞 컬럼부터 후보 포함 여부 확인) 실제 내보내기와 비슷하게 배치
+LAYOUTS = {
+    "ecount_매출": (
+        [["매출장"], ["기간 : 2026/01/01 ~ 2026/03/31"], []],
+        [("date", "일자"), ("slip_no", "전표번호"), ("partner", "거래처명"), ("biz_no", "사업자등록번호"),
+         ("item", "품목"), ("supply", "공급가액"), ("tax", "부가세"), ("total", "합계")],
+        "comma", "dash", "iso",
+    ),
+    "ecount_매입": (
+        [["매입장"], []],
+        [("date", "날짜"), ("slip_no", "문서번호"), ("partner", "거래처"), ("biz_no", "사업자번호"),
+         ("item", "적요"), ("supply", "공급가"), ("tax", "세액"), ("total", "합계금액")],
+        "won", "dash", "slash",
+    ),
+    "hometax_매출": (
+        [],
+        [("date", "작성일자"), ("slip_no", "승인번호"), ("partner", "공급받는자상호"),
+         ("biz_no", "공급받는자사업자등록번호"), ("item", "품목명"),
+         ("supply", "공급가액"), ("tax", "세액"), ("total", "합계금액")],
+        "comma", "digits", "datetime",
+    ),
+    "hometax_매입": (
+        [],
+        [("date", "작성일자"), ("slip_no", "승인번호"), ("partner", "공급자상호"),
+         ("biz_no", "공급자사업자등록번호"), ("item", "품명"),
+         ("supply", "공급가액"), ("total", "총액"), ("tax", "세액합계")],
+        "number", "digits", "compact",
+    ),
+}
+ITEMS = ["의류", "잡화", "식품", "생활용품", "화장품", "전자기기", "배송비", "판매수수료"]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 1. 합성 데이터 생성
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def generate_lines(rows: int, seed: int, missing_rate: float, mismatch_rate: float) -> dict:
+    """
+    한 방향(매출 또는 매입) 세금계산서 rows건과 주입할 차이.
+
+    Returns:
+        dict: 공통 컬럼 배열 + drop_ht / drop_ec / mutate (행 번호 배열) + delta (불일치 금액)
+    """
+    rng = np.random.default_rng(seed)
+    partners = max(50, rows // 40)
+    biz = rng.choice(9_000_000_000, size=partners, replace=False) + 1_000_000_000
+    who = rng.integers(0, partners, rows)
+    supply = rng.integers(1_000, 5_000_000, rows) // 10 * 10
+    days = rng.integers(0, QUARTER_DAYS, rows)
+
+    k_missing = int(rows * missing_rate)
+    k_mismatch = int(rows * mismatch_rate)
+    picked = rng.permutation(rows)[: 2 * k_missing + k_mismatch]
+    mutate = np.sort(picked[2 * k_missing:])
+    delta = rng.integers(2, 5_000, len(mutate)) * rng.choice([-1, 1], len(mutate))
+    return {
+        "partner": who,
+        "biz": biz[who],
+        "supply": supply,
+        "tax": supply // 10,
+        "days": days,
+        "item": rng.integers(0, len(ITEMS), rows),
+        "drop_ht": np.sort(picked[:k_missing]),
+        "drop_ec": np.sort(picked[k_missing:2 * k_missing]),
+        "mutate": mutate,
+        "delta": delta,
+    }
+
+
+def _format_amounts(values, style):
+    if style == "comma":
+        return [f"{v:,}" for v in values.tolist()]
+    if style == "won":
+        return [f"{v:,}원" for v in values.tolist()]
+    return values.tolist()
+
+
+def _format_biz(values, style):
+    if style == "dash":
+        return [f"{s[:3]}-{s[3:5]}-{s[5:]}" for s in map(str, values.tolist())]
+    return [str(v) for v in values.tolist()]
+
+
+def _format_dates(days, style):
+    dates = [QUARTER_START + timedelta(days=d) for d in range(QUARTER_DAYS)]
+    if style == "datetime":
+        table = [datetime(d.year, d.month, d.day) for d in dates]
+    elif style == "slash":
+        table = [d.strftime("%Y/%m/%d") for d in dates]
+    elif style == "compact":
+        table = [d.strftime("%Y%m%d") for d in dates]
+    else:
+        table = [d.isoformat() for d in dates]
+    return [table[d] for d in days.tolist()]
+
+
+def write_workbook(path: Path, layout, lines: dict, keep, supply):
+    """keep 행만, supply(불일치 주입 후 공급가액)로 레이아웃대로 엑셀 저장 (write-only)."""
+    title_rows, columns, amount_style, biz_style, date_style = layout
+    tax = lines["tax"][keep]
+    values = {
+        "date": _format_dates(lines["days"][keep], date_style),
+        "slip_no": [f"{QUARTER_START:%Y%m%d}-{i:08d}" for i in keep.tolist()],
+        "partner": [f"(주)거래처{p:05d}" for p in lines["partner"][keep].tolist()],
+        "biz_no": _format_biz(lines["biz"][keep], biz_style),
+        "item": [ITEMS[i] for i in lines["item"][keep].tolist()],
+        "supply": _format_amounts(supply[keep], amount_style),
+        "tax": _format_amounts(tax, amount_style),
+        "total": _format_amounts(supply[keep] + tax, amount_style),
+    }
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    for row in title_rows:
+        ws.append(row)
+    ws.append([header for _, header in columns])
+    for row in zip(*(values[name] for name, _ in columns)):
+        ws.append(row)
+    wb.save(path)
+
+
+def expected_results(lines: dict) -> dict:
+    """주입한 차이로부터 기대 대조 결과 (invoice: 전표번호, partner: 사업자번호별 합계)."""
+    rows = len(lines["supply"])
+    slip = lambda idx: {f"{QUARTER_START:%Y%m%d}{i:08d}" for i in idx.tolist()}
+
+    ec_sum, ht_sum = {}, {}
+    ht_supply = lines["supply"].copy()
+    ht_supply[lines["mutate"]] += lines["delta"]
+    ec_keep = np.setdiff1d(np.arange(rows), lines["drop_ec"])
+    ht_keep = np.setdiff1d(np.arange(rows), lines["drop_ht"])
+    for sums, keep, amounts in [(ec_sum, ec_keep, lines["supply"]), (ht_sum, ht_keep, ht_supply)]:
+        for b, v in zip(lines["biz"][keep].tolist(), amounts[keep].tolist()):
+            sums[str(b)] = sums.get(str(b), 0) + v
+
+    partner = {"missing_in_hometax": set(), "missing_in_ecount": set(), "amount_mismatch": {}}
+    for b in ec_sum.keys() | ht_sum.keys():
+        ec, ht = ec_sum.get(b, 0), ht_sum.get(b, 0)
+        if ec > 0 and ht == 0:
+            partner["missing_in_hometax"].add(b)
+        elif ec == 0 and ht > 0:
+            partner["missing_in_ecount"].add(b)
+        elif abs(ec - ht) > 1:
+            partner["amount_mismatch"][b] = ec - ht
+
+    return {
+        "invoice": {
+            "missing_in_hometax": slip(lines["drop_ht"]),
+            "missing_in_ecount": slip(lines["drop_ec"]),
+            "amount_mismatch": slip(lines["mutate"]),
+        },
+        "partner": partner,
+        "ecount_total": int(lines["supply"][ec_keep].sum()),
+        "hometax_total": int(ht_supply[ht_keep].sum()),
+    }
+
+
+def generate_dataset(data_dir: Path, rows: int, seed: int, missing_rate: float, mismatch_rate: float) -> dict:
+    """
+    매출·매입 × 이카운트·홈택스 엑셀 4개 생성 → {"files": {이름: 경로}, "expected": {방향: 기대 결과}}.
+    같은 조건으로 이미 만든 파일이 있으면 다시 만들지 않음 (생성이 측정보다 오래 걸림).
+    """
+    params = {"rows": rows, "seed": seed, "missing_rate": missing_rate, "mismatch_rate": mismatch_rate}
+    data_dir.mkdir(parents=True, exist_ok=True)
+    manifest = data_dir / "manifest.json"
+    files = {name: data_dir / f"{name}.xlsx" for name in LAYOUTS}
+
+    reuse = False
+    if manifest.exists() and all(p.exists() for p in files.values()):
+        reuse = json.loads(manifest.read_text(encoding="utf-8")) == params
+
+    expected = {}
+    for n, direction in enumerate(["매출", "매입"]):
+        lines = generate_lines(rows, seed + n, missing_rate, mismatch_rate)
+        expected[direction] = expected_results(lines)
+        if reuse:
+            continue
+        ht_supply = lines["supply"].copy()
+        ht_supply[lines["mutate"]] += lines["delta"]
+        everything = np.arange(rows)
+        write_workbook(files[f"ecount_{direction}"], LAYOUTS[f"ecount_{direction}"], lines,
+                       np.setdiff1d(everything, lines["drop_ec"]), lines["supply"])
+        write_workbook(files[f"hometax_{direction}"], LAYOUTS[f"hometax_{direction}"], lines,
+                       np.setdiff1d(everything, lines["drop_ht"]), ht_supply)
+
+    if not reuse:
+        manifest.write_text(json.dumps(params), encoding="utf-8")
+    return {"files": files, "expected": expected, "reused": reuse}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 2. 정확성 확인
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _slips(series):
+    return {re.sub(r"[^0-9A-Za-z]", "", str(s)) for s in series.tolist()}
+
+
+def check_results(res: dict, expected: dict, mode: str) -> list:
+    """대조 결과와 주입한 차이 비교 → 다른 점 목록 (비었으면 정확)."""
+    problems = []
+    for key in ["ecount_total", "hometax_total"]:
+        if int(res[key]) != expected[key]:
+            problems.append(f"{key} {int(res[key]):,} ≠ 기대 {expected[key]:,}")
+
+    if mode == "invoice":
+        want = expected["invoice"]
+        found = {
+            "missing_in_hometax": _slips(res["missing_in_hometax"]["전표번호"]),
+            "missing_in_ecount": _slips(res["missing_in_ecount"]["전표번호"]),
+            "amount_mismatch": _slips(res["amount_mismatch"]["전표번호(이카운트)"]),
+        }
+        reasons = set(res["amount_mismatch"]["불일치"].tolist())
+        if reasons - {"공급가액"}:
+            problems.append(f"amount_mismatch 사유 {sorted(reasons)} (기대: 공급가액만)")
+    else:
+        want = expected["partner"]
+        mismatch = res["amount_mismatch"]
+        found = {
+            "missing_in_hometax": set(res["missing_in_hometax"]["거래처"].astype(str)),
+            "missing_in_ecount": set(res["missing_in_ecount"]["거래처"].astype(str)),
+            "amount_mismatch": dict(zip(mismatch["거래처"].astype(str), mismatch["차이"].astype(int))),
+        }
+
+    for key, value in want.items():
+        if found[key] != value:
+            extra = len(set(found[key]) - set(value))
+            missed = len(set(value) - set(found[key]))
+            problems.append(f"{key}: 기대 {len(value)}건, 결과 {len(found[key])}건 "
+                            f"(놓침 {missed}, 잘못 잡음 {extra}, 그 외 값 차이)")
+    return problems
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 3. 단계별 측정
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def timed(record: dict, stage: str, fn, *args, **kwargs):
+    """fn 실행 시간 (초)을 record[stage]에 누적, tracemalloc이 켜져 있으면 최대 할당량 (MB)도."""
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    entry = record.setdefault(stage, {"seconds": 0.0})
+    entry["seconds"] += elapsed
+    if tracing:
+        peak = (tracemalloc.get_traced_memory()[1] - base) / 1024 / 1024
+        entry["peak_mb"] = round(max(entry.get("peak_mb", 0.0), peak), 1)
+    return result
+
+
+def run_stages(files: dict, modes: list, output_dir: Path) -> tuple:
+    """
+    한 번 전체 실행 → ({단계: 측정값}, {모드: {방향: compare_data 결과}}).
+    load_excel은 파싱 캐시 없이 (매번 실제 파싱).
+    """
+    record = {}
+    frames = {name: timed(record, "load_excel", vat_checker.load_excel, path, False)
+              for name, path in files.items()}
+    for df in frames.values():
+        timed(record, "map_columns", vat_checker.map_columns, df)
+
+    results = {}
+    for mode in modes:
+        sell = timed(record, f"compare_data[{mode}]", vat_checker.compare_data,
+                     frames["ecount_매출"], frames["hometax_매출"], "매출", mode)
+        buy = timed(record, f"compare_data[{mode}]", vat_checker.compare_data,
+                    frames["ecount_매입"], frames["hometax_매입"], "매입", mode)
+        vat_checker.OUTPUT_DIR = output_dir  # 실제 output/ 대신 임시 폴더에 리포트 저장
+        timed(record, f"create_report[{mode}]", vat_checker.create_report, sell, buy, f"bench_{mode}")
+        results[mode] = {"매출": sell, "매입": buy}
+    return record, results, frames
+
+
+def expected_mapping(name: str) -> dict:
+    return {standard: header for standard, header in LAYOUTS[name][1]}
+
+
+def bench_size(rows: int, args, data_root: Path) -> dict:
+    started = time.perf_counter()
+    dataset = generate_dataset(data_root / f"rows_{rows}", rows, args.seed, args.missing_rate, args.mismatch_rate)
+    sizes_mb = {name: round(p.stat().st_size / 1024 / 1024, 1) for name, p in dataset["files"].items()}
+    print(f"\n▶ {rows:,}행 × 4개 파일 ({'재사용' if dataset['reused'] else '생성'} "
+          f"{time.perf_counter() - started:.1f}초, {sum(sizes_mb.values()):.1f}MB)")
+
+    with tempfile.TemporaryDirectory(prefix="bench_reconcile_") as tmp:
+        record, results, frames = run_stages(dataset["files"], args.modes, Path(tmp))
+        if args.memory:
+            tracemalloc.start()
+            try:
+                memory, _, _ = run_stages(dataset["files"], args.modes, Path(tmp))
+            finally:
+                tracemalloc.stop()
+            for stage, entry in memory.items():
+                record[stage]["peak_mb"] = entry["peak_mb"]
+
+    problems = []
+    for name, df in frames.items():
+        mapped = vat_checker.map_columns(df)
+        if mapped != expected_mapping(name):
+            problems.append(f"{name} 컬럼 매핑 {mapped} ≠ 기대 {expected_mapping(name)}")
+        if len(df) == 0:
+            problems.append(f"{name} 로딩 결과가 비어 있음")
+    for mode, by_direction in results.items():
+        for direction, res in by_direction.items():
+            problems += [f"{mode}/{direction} {p}" for p in check_results(res, dataset["expected"][direction], mode)]
+
+    for stage, entry in record.items():
+        entry["seconds"] = round(entry["seconds"], 3)
+        memory = f"  최대 {entry['peak_mb']:8.1f}MB" if "peak_mb" in entry else ""
+        print(f"  {stage:24s} {entry['seconds']:8.3f}초{memory}")
+    issues = {mode: {d: {k: len(r[k]) for k in ["missing_in_hometax", "missing_in_ecount", "amount_mismatch"]}
+                     for d, r in by_direction.items()} for mode, by_direction in results.items()}
+    for mode, by_direction in issues.items():
+        print(f"  {mode:8s} " + "  ".join(
+            f"{d} 홈택스 누락 {c['missing_in_hometax']:,} · 이카운트 누락 {c['missing_in_ecount']:,} · "
+            f"불일치 {c['amount_mismatch']:,}" for d, c in by_direction.items()))
+    print("  ✅ 주입한 차이를 정확히 찾음" if not problems else "  ❌ " + "\n  ❌ ".join(problems))
+
+    return {"rows": rows, "file_mb": sizes_mb, "stages": record, "issues": issues, "problems": problems}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부가세 셀프 체크 대조 벤치마크 (합성 엑셀)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="파일당 행 수 (여러 개면 각각 측정)")
+    parser.add_argument("--modes", nargs="+", choices=["partner", "invoice"], default=["partner", "invoice"])
+    parser.add_argument("--missing-rate", type=float, default=0.01, help="홈택스·이카운트 누락 행 비율 (각각)")
+    parser.add_argument("--mismatch-rate", type=float, default=0.01, help="공급가액 불일치 행 비율")
+    parser.add_argument("--seed", type=int, default=20260101)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="메모리 측정 생략")
+    parser.add_argument("--data-dir", default=None,
+                        help="생성한 엑셀을 보관·재사용할 폴더 (기본: 임시 폴더, 끝나면 삭제)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: output/bench_reconcile_시각.json)")
+    args = parser.parse_args()
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "reader": "calamine" if CalamineWorkbook is not None else "openpyxl",
+        "missing_rate": args.missing_rate,
+        "mismatch_rate": args.mismatch_rate,
+        "seed": args.seed,
+        "sizes": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_reconcile_data_") as tmp:
+        data_root = Path(args.data_dir) if args.data_dir else Path(tmp)
+        for rows in args.rows:
+            results["sizes"].append(bench_size(rows, args, data_root))
+
+    output = Path(args.output) if args.output else (
+        BASE_DIR / "output" / f"bench_reconcile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n📄 결과 저장: {output}")
+
+    if any(size["problems"] for size in results["sizes"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+대시보드 시작 시간 벤치마크
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+앱을 실행해서 첫 화면(/)이 200으로 응답할 때까지의 시간, import 시간,
+대기 상태 메모리(RSS), 번들 크기를 재고 JSON으로 저장합니다.
+이전 결과와 비교해서 느려졌으면 종료 코드 1로 알려줍니다.
+
+대상:
+    source   python app.py (소스 실행)
+    onedir   build.py로 폴더 모드 빌드 후 실행
+    onefile  build.py --onefile 빌드 후 실행 (PyInstaller 필요)
+    --exe    이미 빌드된 실행파일
+
+매 실행은 임시 폴더의 복사본에서 돌아가므로 실제 input/·설정에 영향이 없습니다.
+
+사용법:
+    python bench_startup.py                                  (source, 5회)
+    python bench_startup.py --targets source onedir onefile  (빌드 포함 비교)
+    python bench_startup.py --exe dist/세무자료수집/세무자료수집
+    python bench_startup.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import psutil  # 선택 — 없으면 Linux는 /proc, 그 외 OS는 RSS 미측정
+except ImportError:
+    psutil = None
+
+BASE_DIR = Path(__file__).parent
+APP_NAME = "세무자료수집"
+STARTUP_TIMEOUT = 60    # 첫 응답 대기 한도 (초) — onefile 첫 실행은 압축 해제로 오래 걸림
+POLL_INTERVAL = 0.01
+BENCH_CONFIG = {"company_name": "벤치마크"}
+
+# --compare 대상 지표 (모두 클수록 나쁨)
+METRICS = ["first_response_ms", "import_ms", "rss_idle_mb", "bundle_mb"]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 1. 실행 대상 준비 (임시 폴더 복사본)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _dir_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def prepare_source(work: Path) -> dict:
+    """소스 파일 + 템플릿만 복사 (input/·output/·설정은 새로)."""
+    root = work / "source"
+    root.mkdir()
+    for f in BASE_DIR.glob("*.py"):
+        shutil.copy2(f, root / f.name)
+    shutil.copytree(BASE_DIR / "templates", root / "templates")
+    return {"name": "source", "command": [sys.executable, "app.py"], "cwd": root, "bundle": None}
+
+
+def prepare_build(work: Path, onefile: bool) -> dict:
+    """build.py로 임시 폴더에 빌드 (기존 dist/는 건드리지 않음)."""
+    name = "onefile" if onefile else "onedir"
+    dist = work / name
+    cmd = [sys.executable, str(BASE_DIR / "build.py"), f"--distpath={dist}"]
+    if onefile:
+        cmd.append("--onefile")
+    print(f"  🔨 {name} 빌드 중...")
+    build_started = time.perf_counter()
+    subprocess.run(cmd, cwd=BASE_DIR, check=True, stdout=subprocess.DEVNULL)
+    build_seconds = time.perf_counter() - build_started
+
+    from build import exe_path
+    exe = exe_path(onefile, dist)
+    if not exe.exists():
+        raise SystemExit(f"빌드 결과가 없습니다: {exe}")
+    return {
+        "name": name,
+        "command": [str(exe)],
+        "cwd": exe.parent,
+        "bundle": exe if onefile else exe.parent,
+        "build_seconds": round(build_seconds, 1),
+    }
+
+
+def prepare_exe(work: Path, exe: Path) -> dict:
+    """이미 빌드된 실행파일 복사 (폴더 모드면 폴더째)."""
+    exe = Path(exe).resolve()
+    onedir = (exe.parent / "_internal").exists() or exe.parent.name == APP_NAME
+    if onedir:
+        root = work / "exe" / exe.parent.name
+        shutil.copytree(exe.parent, root, symlinks=True)
+        bundle = root
+    else:
+        root = work / "exe"
+        root.mkdir()
+        shutil.copy2(exe, root / exe.name)
+        bundle = root / exe.name
+    return {"name": "onedir" if onedir else "onefile", "command": [str(root / exe.name)], "cwd": root,
+            "bundle": bundle}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 2. 프로세스 측정
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _children_linux(pid: int) -> list:
+    """/proc에서 pid의 모든 하위 프로세스 (onefile은 부트로더 아래 실제 앱이 따로 뜸)."""
+    parents = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        parents.setdefault(ppid, []).append(int(entry.name))
+    found, queue = [], [pid]
+    while queue:
+        for child in parents.get(queue.pop(), []):
+            found.append(child)
+            queue.append(child)
+    return found
+
+
+def _process_tree(pid: int) -> list:
+    if psutil is not None:
+        try:
+            return [pid] + [c.pid for c in psutil.Process(pid).children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return []
+    if sys.platform.startswith("linux"):
+        return [pid] + _children_linux(pid)
+    return [pid]
+
+
+def rss_mb(pid: int):
+    """프로세스 트리 전체 RSS (MB) — 측정할 수 없으면 None."""
+    total = 0
+    for p in _process_tree(pid):
+        if psutil is not None:
+            try:
+                total += psutil.Process(p).memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+        elif sys.platform.startswith("linux"):
+            try:
+                status = Path(f"/proc/{p}/status").read_text()
+            except OSError:
+                continue
+            match = re.search(r"VmRSS:\s+(\d+) kB", status)
+            total += int(match.group(1)) * 1024 if match else 0
+        else:
+            return None
+    return round(total / 1024 / 1024, 1)
+
+
+def stop(proc: subprocess.Popen):
+    """하위 프로세스까지 종료."""
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(proc.pid)], capture_output=True)
+    else:
+        for p in reversed(_process_tree(proc.pid)):
+            try:
+                os.kill(p, 15)
+            except OSError:
+                pass
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def measure_startup(target: dict, idle_seconds: float) -> dict:
+    """실행 → / 첫 200 응답까지 시간 → 대기 후 RSS."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    cmd = target["command"] + ["--port", str(port), "--no-browser"]
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=target["cwd"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            stdin=subprocess.DEVNULL)
+    try:
+        first_response = None
+        while time.perf_counter() - started < STARTUP_TIMEOUT:
+            if proc.poll() is not None:
+                raise RuntimeError(f"앱이 응답 전에 종료됨 (exit {proc.returncode}): {' '.join(cmd)}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        first_response = time.perf_counter() - started
+                        break
+            except OSError:
+                time.sleep(POLL_INTERVAL)
+        if first_response is None:
+            raise RuntimeError(f"{STARTUP_TIMEOUT}초 안에 응답 없음: {' '.join(cmd)}")
+        time.sleep(idle_seconds)
+        return {"first_response_ms": round(first_response * 1000, 1), "rss_idle_mb": rss_mb(proc.pid)}
+    finally:
+        stop(proc)
+
+
+def measure_imports(target: dict) -> dict:
+    """
+    --import-profile 실행 — 앱 import 시간, 지연 로딩 모듈별 첫 사용 비용,
+    프로세스 전체 시간 (인터프리터/부트로더 시작 + 지연 로딩 모듈 측정 포함).
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(target["command"] + ["--import-profile"], cwd=target["cwd"],
+                          capture_output=True, stdin=subprocess.DEVNULL)
+    wall = time.perf_counter() - started
+    output = proc.stdout.decode("utf-8", errors="replace")
+    match = re.search(r"측정 시작 후 ([\d,]+)ms", output)
+    lazy = {
+        m.group(2): None if m.group(1) == "미설치" else float(m.group(1).replace(",", ""))
+        for m in re.finditer(r"^\s*([\d,]+|미설치)(?:ms)?\s+(\w+)\s", output.split("지연 로딩")[-1], re.M)
+    }
+    return {
+        "import_ms": float(match.group(1).replace(",", "")) if match else None,
+        "import_process_ms": round(wall * 1000, 1),
+        "lazy_import_ms": lazy,
+    }
+
+
+def run_target(target: dict, runs: int, idle_seconds: float) -> dict:
+    (Path(target["cwd"]) / "config_local.json").write_text(
+        json.dumps(BENCH_CONFIG, ensure_ascii=False), encoding="utf-8"
+    )
+    print(f"\n▶ {target['name']}: {' '.join(target['command'])}")
+
+    samples = []
+    for i in range(runs):
+        sample = measure_startup(target, idle_seconds)
+        samples.append(sample)
+        print(f"  #{i + 1}  첫 응답 {sample['first_response_ms']:,.0f}ms  RSS {sample['rss_idle_mb']}MB")
+
+    first = [s["first_response_ms"] for s in samples]
+    rss = [s["rss_idle_mb"] for s in samples if s["rss_idle_mb"] is not None]
+    result = {
+        "name": target["name"],
+        "command": target["command"][-1] if target["bundle"] else "app.py",
+        "runs": samples,
+        "first_response_ms": statistics.median(first),
+        "first_response_min_ms": min(first),
+        "first_response_max_ms": max(first),
+        "rss_idle_mb": statistics.median(rss) if rss else None,
+        "bundle_mb": round(_dir_size(target["bundle"]) / 1024 / 1024, 1) if target["bundle"] else None,
+        **measure_imports(target),
+    }
+    if "build_seconds" in target:
+        result["build_seconds"] = target["build_seconds"]
+    bundle = f"{result['bundle_mb']}MB" if result["bundle_mb"] is not None else "-"
+    print(f"  중앙값 {result['first_response_ms']:,.0f}ms · import {result['import_ms']}ms · "
+          f"RSS {result['rss_idle_mb']}MB · 번들 {bundle}")
+    return result
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 3. 결과 저장 / 비교
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """기준 결과 대비 tolerance(비율) 넘게 나빠진 지표 목록."""
+    regressions = []
+    before = {t["name"]: t for t in baseline.get("targets", [])}
+    print(f"\n{'─' * 60}\n  기준 결과와 비교 (허용 +{tolerance:.0%})")
+    for target in current["targets"]:
+        old = before.get(target["name"])
+        if old is None:
+            continue
+        for metric in METRICS:
+            new_value, old_value = target.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            change = new_value / old_value - 1
+            flag = "❌" if change > tolerance else "  "
+            print(f"  {flag} {target['name']:8s} {metric:18s} {old_value:>10,.1f} → {new_value:>10,.1f} ({change:+.1%})")
+            if change > tolerance:
+                regressions.append(f"{target['name']}.{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 시작 시간 벤치마크")
+    parser.add_argument("--targets", nargs="+", choices=["source", "onedir", "onefile"], default=None,
+                        help="측정 대상 (기본: source, --exe를 주면 그 실행파일만)")
+    parser.add_argument("--exe", default=None, help="이미 빌드된 실행파일 경로")
+    parser.add_argument("--runs", type=int, default=5, help="대상별 실행 횟수")
+    parser.add_argument("--idle", type=float, default=2.0, help="첫 응답 후 RSS 측정까지 대기 (초)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: output/bench_startup_시각.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="--compare 허용 악화 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    targets = args.targets or ([] if args.exe else ["source"])
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "runs": args.runs,
+        "targets": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as tmp:
+        work = Path(tmp)
+        prepared = []
+        if args.exe:
+            prepared.append(prepare_exe(work, args.exe))
+        for name in targets:
+            prepared.append(prepare_source(work) if name == "source" else prepare_build(work, name == "onefile"))
+        for target in prepared:
+            results["targets"].append(run_target(target, args.runs, args.idle))
+
+    output = Path(args.output) if args.output else (
+        BASE_DIR / "output" / f"bench_startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n📄 결과 저장: {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 느려짐: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ 기준 대비 악화 없음")
+
+
+if __name__ == "__main__":
+    main()
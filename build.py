@@ -6,6 +6,8 @@ PyInstaller 빌드 스크립트
     python build.py --onefile  (단일 실행파일)
     python build.py --clean    (빌드 캐시 삭제 후 빌드)
 
+onefile은 실행할 때마다 번들 전체를 임시 폴더에 풀기 때문에 onedir보다 시작이 느립니다.
+
 결과물:
     dist/세무자료수집/         (onedir 모드)
     dist/세무자료수집.exe      (onefile 모드, Windows)
@@ -28,7 +30,14 @@ ENTRY = "app.py"
 BASE_DIR = Path(__file__).parent
 
 
-def build(onefile=False, clean=False):
+def exe_path(onefile=False, dist_dir=None) -> Path:
+    """빌드 결과 실행파일 경로."""
+    dist_dir = Path(dist_dir or BASE_DIR / "dist")
+    name = f"{APP_NAME}.exe" if sys.platform == "win32" else APP_NAME
+    return dist_dir / name if onefile else dist_dir / APP_NAME / name
+
+
+def build(onefile=False, clean=False, dist_dir=None):
     # PyInstaller 설치 확인
     try:
         import PyInstaller.__main__
@@ -59,11 +68,24 @@ def build(onefile=False, clean=False):
         "--noconfirm",
         "--clean",
         # 숨김 import (flask, openpyxl 등은 자동 감지됨)
+        # app.py가 함수 안에서 지연 import하는 모듈도 여기 있어야 번들에 포함됨
         "--hidden-import=config",
         "--hidden-import=paths",
+        "--hidden-import=file_index",
+        "--hidden-import=events",
+        "--hidden-import=uploads",
+        "--hidden-import=hash_store",
+        "--hidden-import=resumable",
         "--hidden-import=tax_package",
         "--hidden-import=vat_checker",
+        "--hidden-import=excel_reader",
+        "--hidden-import=workbook_cache",
+        "--hidden-import=vat_jobs",
+        "--hidden-import=vat_constants",
+        "--hidden-import=import_profile",
+        "--hidden-import=metrics",
         "--hidden-import=platform_opener",
+        "--hidden-import=waitress",
         # 불필요 모듈 제외 (용량 줄이기)
         "--exclude-module=tkinter",
         "--exclude-module=matplotlib",
@@ -76,6 +98,8 @@ def build(onefile=False, clean=False):
         args.append("--onefile")
     else:
         args.append("--onedir")
+    if dist_dir:
+        args.append(f"--distpath={dist_dir}")
 
     # 아이콘 (있으면 사용)
     icon_path = BASE_DIR / "icon.ico"
@@ -93,30 +117,26 @@ def build(onefile=False, clean=False):
     PyInstaller.__main__.run(args)
 
     # 빌드 결과 안내
-    if onefile:
-        if sys.platform == "win32":
-            exe_path = BASE_DIR / "dist" / f"{APP_NAME}.exe"
-        else:
-            exe_path = BASE_DIR / "dist" / APP_NAME
-    else:
-        exe_path = BASE_DIR / "dist" / APP_NAME
+    result = exe_path(onefile, dist_dir)
 
     print()
     print("=" * 50)
-    if exe_path.exists():
+    if result.exists():
         print(f"  빌드 완료!")
-        print(f"  경로: {exe_path}")
+        print(f"  경로: {result}")
         if not onefile:
             print(f"\n  배포: dist/{APP_NAME}/ 폴더를 통째로 복사하세요.")
             print(f"  실행: dist/{APP_NAME}/{APP_NAME} (또는 .exe)")
     else:
         print("  빌드 실패. 위 로그를 확인하세요.")
     print("=" * 50)
+    return result
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description=f"{APP_NAME} 빌드")
     parser.add_argument("--onefile", action="store_true", help="단일 실행파일 (느리지만 배포 간편)")
     parser.add_argument("--clean", action="store_true", help="빌드 캐시 삭제 후 빌드")
+    parser.add_argument("--distpath", default=None, help="결과물 폴더 (기본: dist/)")
     args = parser.parse_args()
-    build(onefile=args.onefile, clean=args.clean)
+    build(onefile=args.onefile, clean=args.clean, dist_dir=args.distpath)
@@ -2,10 +2,20 @@
 설정 관리 모듈
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 config_local.json을 읽고/쓰고, 첫 실행 시 대화형 설정 마법사를 제공합니다.
+
+load_config()는 파일 mtime/size 기준으로 캐시된 읽기전용 설정을 반환합니다.
+config_version()은 설정 내용이 바뀔 때만 달라지는 토큰입니다 (산출물 캐시 키용).
+start_config_watcher()를 켜면 요청마다 stat 하지 않고 감시 스레드가 갱신합니다.
 """
+import hashlib
 import json
+import os
+import threading
+import time
 from pathlib import Path
+from types import MappingProxyType
 
+import metrics
 from paths import CONFIG_PATH
 
 DEFAULTS = {
@@ -22,24 +32,111 @@ DEFAULTS = {
         "zigzag", "lotteon", "toss", "alwayz",
     ],
     "port": 5000,
+    "max_upload_mb": 2048,
+    "parse_cache_mb": 512,
 }
 
 
-def load_config() -> dict:
-    """config_local.json 로딩. 없으면 DEFAULTS 반환."""
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            saved = json.load(f)
-        # DEFAULTS 키 중 빠진 것 보충
-        merged = {**DEFAULTS, **saved}
-        return merged
-    return dict(DEFAULTS)
+_lock = threading.Lock()
+_cache = {"sig": None, "view": None, "version": None}
+_watcher = None
+
+
+def _signature():
+    """config_local.json 변경 감지용 서명 (없으면 None)."""
+    try:
+        st = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _freeze(value):
+    """리스트를 튜플로 바꿔 캐시된 설정이 수정되지 않도록 함."""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _read_config(sig):
+    if sig is None:
+        return dict(DEFAULTS)
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    # DEFAULTS 키 중 빠진 것 보충
+    return {**DEFAULTS, **saved}
+
+
+@metrics.timed("config", "load_config")
+def _reload(sig):
+    """설정 파일을 다시 읽어 캐시 갱신. _lock 보유 상태에서 호출."""
+    merged = _read_config(sig)
+    view = MappingProxyType({k: _freeze(v) for k, v in merged.items()})
+    raw = json.dumps(merged, ensure_ascii=False, sort_keys=True, default=str)
+    _cache["sig"] = sig
+    _cache["view"] = view
+    _cache["version"] = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    return view
+
+
+def load_config():
+    """
+    config_local.json 로딩. 없으면 DEFAULTS 반환.
+
+    Returns:
+        Mapping: 읽기전용 설정 (수정하려면 dict(cfg) 후 save_config)
+    """
+    view = _cache["view"]
+    if view is not None and _watcher is not None:
+        return view
+    sig = _signature()
+    with _lock:
+        if _cache["view"] is not None and _cache["sig"] == sig:
+            return _cache["view"]
+        return _reload(sig)
+
+
+def config_version() -> str:
+    """현재 설정 내용의 해시 — 저장만 다시 하고 내용이 같으면 그대로."""
+    load_config()
+    return _cache["version"]
+
+
+def invalidate_config():
+    """설정 캐시 비우기 (다음 load_config에서 다시 읽음)."""
+    with _lock:
+        _cache["sig"] = None
+        _cache["view"] = None
 
 
-def save_config(cfg: dict):
+def save_config(cfg):
     """config_local.json 저장."""
     with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, ensure_ascii=False, indent=2)
+        json.dump(dict(cfg), f, ensure_ascii=False, indent=2)
+    invalidate_config()
+
+
+def start_config_watcher(interval=2.0):
+    """config_local.json을 직접 수정한 경우에도 반영되도록 감시 스레드 시작."""
+    global _watcher
+
+    def watch():
+        while True:
+            time.sleep(interval)
+            sig = _signature()
+            with _lock:
+                if _cache["sig"] != sig or _cache["view"] is None:
+                    try:
+                        _reload(sig)
+                    except (OSError, ValueError) as e:
+                        # 편집 도중 저장된 JSON 등 — 이전 설정 유지, 다음 주기에 재시도
+                        print(f"  ⚠️ 설정 다시 읽기 실패: {e}")
+
+    if _watcher is None:
+        with _lock:
+            _reload(_signature())
+        _watcher = threading.Thread(target=watch, daemon=True)
+        _watcher.start()
 
 
 def is_configured() -> bool:
@@ -0,0 +1,167 @@
+"""
+파일 변경 이벤트 피드 (Server-Sent Events)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+input/ 아래 분기·법인세 폴더의 파일 추가/삭제를 대시보드에 push 합니다.
+(부가세 셀프 체크 작업 진행 상황도 같은 연결로 전송 — event: job)
+
+- 업로드/삭제 라우트: notify_changed(폴더) 호출 → 즉시 전송
+- Playwright 다운로드 등 외부 변경: 감시 스레드가 file_index로 확인 후 전송
+- 구독자가 없으면 감시 스레드는 폴더를 읽지 않음
+
+이벤트 형식 (event: change):
+    {"scope": "vat"|"corp"|"input", "period": "2026Q1"|"2025"|"",
+     "added": [{name, size, modified}], "removed": [name]}
+    이전 스냅샷이 없는 폴더는 목록 없이 "refresh": true 만 전송 (전체 다시 읽기)
+"""
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from file_index import list_files
+from paths import INPUT_DIR
+
+WATCH_INTERVAL = 2      # 외부 변경 확인 주기 (초)
+HEARTBEAT_INTERVAL = 15  # 연결 유지용 주석 전송 주기 (초)
+
+_lock = threading.Lock()
+_subscribers = set()
+_snapshots = {}  # str(dir) → {name: file}
+_watcher = None
+
+
+def _scope_of(directory: Path):
+    """폴더 → (scope, period)"""
+    name = directory.name
+    if directory == INPUT_DIR:
+        return "input", ""
+    if name.startswith("법인세_"):
+        return "corp", name[len("법인세_"):]
+    if len(name) == 6 and name[4] == "Q":
+        return "vat", name
+    return None, None
+
+
+def _watched_dirs():
+    """감시 대상: input/ 및 그 아래 분기·법인세 폴더"""
+    dirs = [INPUT_DIR]
+    if INPUT_DIR.exists():
+        dirs.extend(d for d in INPUT_DIR.iterdir() if d.is_dir() and _scope_of(d)[0])
+    return dirs
+
+
+def _diff(directory: Path):
+    """이전 스냅샷과 비교한 변경 이벤트 (변경 없으면 None). _lock 보유 상태에서 호출."""
+    key = str(directory)
+    current = {f["name"]: f for f in list_files(directory)}
+    previous = _snapshots.get(key)
+    _snapshots[key] = current
+    if previous is None:
+        return None
+
+    added = [
+        f for name, f in current.items()
+        if name not in previous
+        or (f["size"], f["mtime"]) != (previous[name]["size"], previous[name]["mtime"])
+    ]
+    removed = [name for name in previous if name not in current]
+    if not added and not removed:
+        return None
+
+    scope, period = _scope_of(directory)
+    return {
+        "scope": scope,
+        "period": period,
+        "added": [
+            {
+                "name": f["name"],
+                "size": f["size"],
+                "modified": datetime.fromtimestamp(f["mtime"]).strftime("%m/%d %H:%M"),
+            }
+            for f in added
+        ],
+        "removed": removed,
+    }
+
+
+def publish(name: str, data: dict):
+    """구독자 전체에 SSE 이벤트 전송 (name은 SSE event 이름)."""
+    for q in list(_subscribers):
+        try:
+            q.put_nowait((name, data))
+        except queue.Full:
+            pass  # 느린 구독자는 건너뜀 (다음 이벤트/재접속 시 전체 갱신)
+
+
+def _publish(event):
+    publish("change", event)
+
+
+def notify_changed(directory: Path):
+    """폴더 변경 직후 호출 — 차이를 계산해 구독자에게 전송."""
+    directory = Path(directory)
+    with _lock:
+        if not _subscribers:
+            _snapshots.pop(str(directory), None)
+            return
+        if str(directory) not in _snapshots:
+            # 변경 이전 상태를 모르면 기준 스냅샷만 잡고 목록 없이 "바뀜"만 알림
+            # (빈 폴더 기준으로 비교하면 기존 파일 전체가 added로 쏟아짐)
+            _diff(directory)
+            scope, period = _scope_of(directory)
+            if scope:
+                _publish({"scope": scope, "period": period, "added": [], "removed": [], "refresh": True})
+            return
+        event = _diff(directory)
+        if event:
+            _publish(event)
+
+
+def _watch_loop():
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        with _lock:
+            if not _subscribers:
+                _snapshots.clear()
+                continue
+            for d in _watched_dirs():
+                event = _diff(d)
+                if event:
+                    _publish(event)
+
+
+def subscribe() -> queue.Queue:
+    """구독 등록 (감시 스레드는 첫 구독 시 시작)."""
+    global _watcher
+    q = queue.Queue(maxsize=100)
+    with _lock:
+        if not _subscribers:
+            for d in _watched_dirs():
+                _diff(d)  # 기준 스냅샷
+        _subscribers.add(q)
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch_loop, daemon=True)
+            _watcher.start()
+    return q
+
+
+def unsubscribe(q: queue.Queue):
+    with _lock:
+        _subscribers.discard(q)
+
+
+def stream(q: queue.Queue):
+    """SSE 응답 본문 생성기 (연결 종료 시 구독 해제)."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                name, data = q.get(timeout=HEARTBEAT_INTERVAL)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    finally:
+        unsubscribe(q)
@@ -0,0 +1,148 @@
+"""
+엑셀 고속 로딩 모듈
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+이카운트/홈택스 내보내기 파일에서 필요한 컬럼만 읽어 DataFrame으로 만듭니다.
+
+- 스타일·서식은 읽지 않고 값만 순차로 읽음 (read-only / streaming)
+- 상단 제목행이 있어도 헤더 행을 자동으로 찾음
+- 컬럼 맵에 해당하는 컬럼만 남기고, 문자열 컬럼은 string 타입으로 고정
+- python-calamine이 설치되어 있으면 사용 (Rust 구현, .xls도 지원)
+  없으면 openpyxl read_only 모드 (.xls는 pandas 기본 엔진)
+
+사용법:
+    from excel_reader import read_table
+    df = read_table(path, COLUMN_MAP)
+"""
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # 선택 의존성 — 없으면 openpyxl로 읽음
+    CalamineWorkbook = None
+
+HEADER_SCAN_ROWS = 20   # 헤더 행을 찾을 상단 행 수
+TEXT_FIELDS = ("partner", "biz_no", "item", "slip_no")  # 숫자처럼 보여도 문자열로 유지
+
+
+def match_headers(headers, column_map) -> dict:
+    """
+    헤더 목록을 표준 이름으로 매핑 (헤더 순서대로 첫 번째로 후보를 포함하는 컬럼).
+
+    Returns:
+        dict: {표준 이름: 헤더}
+    """
+    mapped = {}
+    for standard, candidates in column_map.items():
+        for col in headers:
+            col_clean = str(col).strip().replace(" ", "")
+            if any(cand in col_clean for cand in candidates):
+                mapped[standard] = col
+                break
+    return mapped
+
+
+def _iter_rows_calamine(path: Path):
+    workbook = CalamineWorkbook.from_path(str(path))
+    try:
+        for row in workbook.get_sheet_by_index(0).iter_rows():
+            # calamine은 빈 셀을 ""로 돌려줌 → openpyxl과 같이 None으로
+            yield tuple(None if v == "" else v for v in row)
+    finally:
+        workbook.close()
+
+
+def _iter_rows_openpyxl(path: Path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()  # 내보내기 파일의 잘못된 dimension 정보 무시
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_rows_pandas(path: Path):
+    df = pd.read_excel(path, header=None, dtype=object)
+    for row in df.itertuples(index=False, name=None):
+        yield tuple(None if pd.isna(v) else v for v in row)
+
+
+def iter_rows(path: Path):
+    """첫 시트의 행을 값 튜플로 순회 (사용 가능한 가장 빠른 엔진)."""
+    path = Path(path)
+    if CalamineWorkbook is not None:
+        return _iter_rows_calamine(path)
+    if path.suffix.lower() == ".xls":
+        return _iter_rows_pandas(path)
+    return _iter_rows_openpyxl(path)
+
+
+def _header_score(row, column_map) -> int:
+    return len(match_headers([v for v in row if v is not None], column_map))
+
+
+def read_table(path: Path, column_map: dict) -> pd.DataFrame:
+    """
+    엑셀 첫 시트에서 column_map에 해당하는 컬럼만 읽기.
+
+    Args:
+        path: .xlsx / .xls 파일
+        column_map: {표준 이름: [헤더 후보, ...]} (vat_checker.COLUMN_MAP)
+
+    Returns:
+        DataFrame: 원래 헤더 이름 그대로의 매핑된 컬럼 (완전히 빈 행 제외)
+    """
+    rows = iter_rows(path)
+    try:
+        return _read_rows(rows, column_map)
+    finally:
+        rows.close()  # 중간에 끝나도 워크북 닫기
+
+
+def _read_rows(rows, column_map: dict) -> pd.DataFrame:
+    # 헤더 행 찾기 — 상단에서 표준 컬럼이 가장 많이 잡히는 행 (동점이면 위쪽)
+    head = []
+    for row in rows:
+        head.append(row)
+        if len(head) >= HEADER_SCAN_ROWS:
+            break
+    if not head:
+        return pd.DataFrame()
+    scores = [_header_score(r, column_map) for r in head]
+    header_at = scores.index(max(scores))
+    header = [None if v is None else str(v).strip() for v in head[header_at]]
+
+    mapped = match_headers([h for h in header if h], column_map)
+    # 시트 순서 유지 (map_columns를 다시 적용해도 같은 매핑이 나오도록)
+    index = sorted({header.index(c) for c in mapped.values()})
+    if not index:
+        return pd.DataFrame()
+    columns = [header[i] for i in index]
+    width = max(index) + 1
+    pick = itemgetter(*index)
+
+    records = []
+    for row in chain(head[header_at + 1:], rows):
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        values = pick(row)
+        if len(index) == 1:
+            values = (values,)
+        if any(v is not None for v in values):
+            records.append(values)
+
+    df = pd.DataFrame.from_records(records, columns=columns)
+    text_columns = {mapped[f] for f in TEXT_FIELDS if f in mapped}
+    for col in columns:
+        if col in text_columns:
+            df[col] = df[col].astype("string").str.strip()
+        else:
+            df[col] = df[col].infer_objects()
+    return df
+
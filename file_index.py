@@ -0,0 +1,144 @@
+"""
+입력 폴더 파일 인덱스
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+분기/법인세 폴더를 한 번만 읽어 파일별 크기·수정시각을 보관하고,
+플랫폼·항목 키워드별로 한 번에 묶어 둡니다.
+
+- 디렉토리 mtime/size가 그대로면 목록을 다시 읽지 않음
+- 업로드/삭제 라우트는 invalidate()로 즉시 갱신
+- version()은 파일 구성이 바뀔 때만 달라지는 토큰 (ETag용)
+
+사용법:
+    from file_index import group_files, invalidate
+    groups = group_files(q_dir, ["쿠팡", "11번가"], [".xlsx", ".pdf"])
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+# 같은 mtime 단위(파일시스템에 따라 최대 2초) 안에 일어난 변경은
+# 디렉토리 mtime만으로 구분할 수 없으므로 그동안은 캐시를 신뢰하지 않음
+_RACY_WINDOW_NS = 2_000_000_000
+
+_lock = threading.Lock()
+_entries = {}  # str(dir) → {"sig", "scanned_ns", "files", "groups", "version"}
+
+
+def _dir_signature(directory: Path):
+    """디렉토리 변경 감지용 서명 (없으면 None)."""
+    try:
+        st = os.stat(directory)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _scan(directory: Path) -> list:
+    """디렉토리 1회 순회 — 파일마다 stat 1회."""
+    files = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue  # 업로드 임시파일(.part), 해시 저장소 등
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # 순회 중 삭제된 파일
+                files.append({
+                    "name": entry.name,
+                    "suffix": os.path.splitext(entry.name)[1].lower(),
+                    "size": st.st_size,
+                    "mtime": st.st_mtime,
+                })
+    except FileNotFoundError:
+        return []
+    files.sort(key=lambda f: f["name"])
+    return files
+
+
+def _get_entry(directory: Path) -> dict:
+    """캐시된 인덱스 반환 (변경되었으면 다시 스캔). _lock 보유 상태에서 호출."""
+    key = str(directory)
+    sig = _dir_signature(directory)
+    entry = _entries.get(key)
+    if entry is not None and entry["sig"] == sig and sig is not None:
+        racy = entry["scanned_ns"] - sig[0] < _RACY_WINDOW_NS
+        if not racy:
+            return entry
+
+    files = _scan(directory) if sig is not None else []
+    digest = hashlib.sha1()
+    for f in files:
+        digest.update(f"{f['name']}\0{f['size']}\0{f['mtime']}\n".encode("utf-8"))
+    last_modified = max([f["mtime"] for f in files] + [sig[0] / 1e9 if sig else 0.0])
+
+    entry = {
+        "sig": sig,
+        "scanned_ns": time.time_ns(),
+        "files": files,
+        "groups": {},
+        "version": (digest.hexdigest()[:16], last_modified),
+    }
+    _entries[key] = entry
+    return entry
+
+
+def list_files(directory: Path) -> list:
+    """디렉토리 내 파일 목록 [{name, suffix, size, mtime}] (이름순)."""
+    with _lock:
+        return list(_get_entry(Path(directory))["files"])
+
+
+def group_files(directory: Path, keywords, extensions) -> dict:
+    """
+    파일명에 키워드가 포함된 파일을 키워드별로 묶어 반환.
+
+    Args:
+        directory: 분기/연도 폴더
+        keywords: PLATFORMS/CORP_TAX_ITEMS의 filename 목록
+        extensions: 허용 확장자 (소문자, 점 포함)
+
+    Returns:
+        dict: {keyword: [{name, suffix, size, mtime}, ...]}
+    """
+    keywords = tuple(keywords)
+    extensions = frozenset(extensions)
+    with _lock:
+        entry = _get_entry(Path(directory))
+        cache_key = (keywords, extensions)
+        groups = entry["groups"].get(cache_key)
+        if groups is None:
+            groups = {k: [] for k in keywords}
+            for f in entry["files"]:
+                if f["suffix"] not in extensions:
+                    continue
+                for k in keywords:
+                    if k in f["name"]:
+                        groups[k].append(f)
+            entry["groups"][cache_key] = groups
+        return {k: list(v) for k, v in groups.items()}
+
+
+def version(directory: Path) -> tuple:
+    """
+    파일 구성 버전 반환.
+
+    Returns:
+        tuple: (토큰 문자열, 마지막 수정 시각 timestamp)
+    """
+    with _lock:
+        return _get_entry(Path(directory))["version"]
+
+
+def invalidate(directory: Path = None):
+    """인덱스 무효화 (directory 없으면 전체)."""
+    with _lock:
+        if directory is None:
+            _entries.clear()
+        else:
+            _entries.pop(str(directory), None)
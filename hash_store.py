@@ -0,0 +1,134 @@
+"""
+업로드 파일 내용 해시 저장소
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+input/.hashstore.json에 SHA-256 → 파일 경로를 기록해 동일 내용 재업로드를 찾아냅니다.
+
+- 기록된 경로는 조회 시 크기/수정시각으로 검증, 바뀌었거나 없어진 항목은 제거
+- 저장소에 없는 기존 파일(Playwright 다운로드 등)도 같은 크기인 것만 해시해서 비교
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from file_index import list_files
+from paths import INPUT_DIR
+
+STORE_PATH = INPUT_DIR / ".hashstore.json"
+CHUNK_SIZE = 1024 * 1024
+
+_lock = threading.Lock()
+_store = None  # sha256 → [{"path", "size", "mtime_ns"}]
+
+
+def file_sha256(path: Path) -> str:
+    """파일 SHA-256 (청크 단위)."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _load() -> dict:
+    global _store
+    if _store is None:
+        try:
+            with open(STORE_PATH, "r", encoding="utf-8") as f:
+                _store = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _store = {}
+    return _store
+
+
+def _save():
+    tmp = STORE_PATH.with_name(STORE_PATH.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_store, f, ensure_ascii=False)
+    os.replace(tmp, STORE_PATH)
+
+
+def _rel(path: Path) -> str:
+    return Path(path).resolve().relative_to(INPUT_DIR.resolve()).as_posix()
+
+
+def _record(sha256: str, path: Path, st):
+    """저장소에 경로 추가 (같은 경로 기존 항목은 교체). _lock 보유 상태에서 호출."""
+    rel = _rel(path)
+    entries = _load().setdefault(sha256, [])
+    entries[:] = [e for e in entries if e["path"] != rel]
+    entries.append({"path": rel, "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+
+
+def _valid_paths(sha256: str) -> list:
+    """기록된 경로 중 아직 유효한 것. _lock 보유 상태에서 호출."""
+    store = _load()
+    entries = store.get(sha256, [])
+    valid = []
+    for e in entries:
+        path = INPUT_DIR / e["path"]
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if st.st_size == e["size"] and st.st_mtime_ns == e["mtime_ns"]:
+            valid.append(e)
+    if len(valid) != len(entries):
+        if valid:
+            store[sha256] = valid
+        else:
+            store.pop(sha256, None)
+        _save()
+    return [INPUT_DIR / e["path"] for e in valid]
+
+
+def find(sha256: str, size: int, directory: Path = None) -> list:
+    """
+    같은 내용의 기존 파일 목록.
+
+    Args:
+        sha256: 찾을 해시
+        size: 파일 크기 (directory 내 미등록 파일 중 크기가 같은 것만 해시)
+        directory: 저장소에 없는 파일까지 확인할 폴더
+
+    Returns:
+        list[Path]: 같은 내용의 파일 경로
+    """
+    with _lock:
+        found = _valid_paths(sha256)
+        if directory is None:
+            return found
+
+        known = {e["path"] for entries in _load().values() for e in entries}
+        candidates = [
+            Path(directory) / f["name"] for f in list_files(directory)
+            if f["size"] == size and _rel(Path(directory) / f["name"]) not in known
+        ]
+
+    # 해시는 잠금 밖에서 — 큰 파일을 읽는 동안 다른 업로드의 find/add를 막지 않음
+    # (stat을 먼저 — 해시 도중 바뀐 파일은 다음 조회 때 크기/수정시각 검증에서 빠짐)
+    hashed = []
+    for path in candidates:
+        try:
+            st = os.stat(path)
+            digest = file_sha256(path)
+        except FileNotFoundError:
+            continue
+        hashed.append((digest, path, st))
+        if digest == sha256:
+            found.append(path)
+
+    if hashed:
+        with _lock:
+            for digest, path, st in hashed:
+                _record(digest, path, st)
+            _save()
+    return found
+
+
+def add(path: Path, sha256: str):
+    """업로드 완료된 파일 등록."""
+    with _lock:
+        _record(sha256, path, os.stat(path))
+        _save()
@@ -0,0 +1,102 @@
+"""
+import 시간 측정 (app.py --import-profile)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+모듈별로 처음 import하는 데 걸린 시간을 기록합니다.
+python -X importtime과 비슷하지만 PyInstaller 실행파일에서도 동작합니다.
+
+- 누적: 그 모듈이 끌어온 하위 모듈 포함 시간
+- 자체: 하위 모듈을 뺀 그 모듈 본문 실행 시간
+- 이미 불러온 모듈을 다시 import하는 경우는 기록하지 않음
+
+사용법:
+    import import_profile
+    import_profile.install()     ← 측정할 import보다 먼저
+    ...
+    import_profile.report()
+"""
+import builtins
+import sys
+import time
+
+_original_import = builtins.__import__
+_records = {}   # 모듈 이름 → [누적 초, 자체 초]
+_stack = []     # 진행 중인 import별 하위 import 누적 시간
+_started = None
+
+
+def _module_name(name, globals_, level):
+    """상대 import(from . import x)를 절대 이름으로."""
+    if level == 0 or not globals_:
+        return name
+    package = globals_.get("__package__") or ""
+    base = package.rsplit(".", level - 1)[0] if level > 1 else package
+    return f"{base}.{name}" if name else base
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    module = _module_name(name, globals, level)
+    if module in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        record = _records.setdefault(module, [0.0, 0.0])
+        record[0] += elapsed
+        record[1] += elapsed - children
+
+
+def install():
+    """builtins.__import__를 측정용으로 교체 (여러 번 불러도 한 번만)."""
+    global _started
+    if builtins.__import__ is not _timed_import:
+        _started = time.perf_counter()
+        builtins.__import__ = _timed_import
+
+
+def uninstall():
+    builtins.__import__ = _original_import
+
+
+def measure(name: str) -> float:
+    """모듈을 지금 불러오고 걸린 시간 (초) — 지연 로딩 모듈의 첫 사용 비용 확인용."""
+    if name in sys.modules:
+        return 0.0
+    start = time.perf_counter()
+    try:
+        __import__(name)
+    except ImportError:
+        return -1.0  # 선택 의존성 미설치
+    return time.perf_counter() - start
+
+
+def records() -> dict:
+    """{모듈 이름: (누적 초, 자체 초)}"""
+    return {name: tuple(r) for name, r in _records.items()}
+
+
+def report(limit: int = 25, out=None):
+    """자체 시간이 큰 모듈부터 limit개 출력 (최상위 패키지별 합계 포함)."""
+    out = out or sys.stdout
+    total = time.perf_counter() - _started if _started else 0.0
+    rows = sorted(_records.items(), key=lambda kv: kv[1][1], reverse=True)
+
+    packages = {}
+    for name, (_, own) in _records.items():
+        top = name.split(".")[0]
+        packages[top] = packages.get(top, 0.0) + own
+
+    print(f"\n  import 시간 (측정 시작 후 {total * 1000:,.0f}ms, 모듈 {len(_records)}개)", file=out)
+    print(f"  {'자체(ms)':>9} {'누적(ms)':>9}  모듈", file=out)
+    for name, (cumulative, own) in rows[:limit]:
+        print(f"  {own * 1000:9.1f} {cumulative * 1000:9.1f}  {name}", file=out)
+
+    print(f"\n  패키지별 합계 (자체 시간)", file=out)
+    for top, own in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:10]:
+        print(f"  {own * 1000:9.1f}  {top}", file=out)
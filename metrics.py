@@ -0,0 +1,193 @@
+"""
+요청·내부 작업 시간 측정 (선택, 기본 꺼짐)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+요청 하나의 시간이 어디에 쓰였는지 보기 위한 계측입니다.
+
+- 라우트별 요청 처리 시간 히스토그램 + 상태 코드별 요청 수
+- 내부 작업(폴더 스캔·설정 로딩·파일 기록·패키지 생성) 시간 히스토그램
+- GET /api/metrics       Prometheus 텍스트 형식
+- Server-Timing 헤더     요청 중 실행된 내부 작업 시간 (브라우저 개발자 도구 Network → Timing)
+
+켜기: python3 app.py --metrics  또는  환경변수 TAX_DASHBOARD_METRICS=1
+꺼져 있으면 계측 함수는 플래그 하나만 확인하고 원래 함수를 그대로 호출합니다
+(요청 훅·/api/metrics 라우트도 등록하지 않음).
+
+스트리밍 응답(/api/events)은 응답 헤더를 보낼 때까지의 시간만 기록됩니다.
+"""
+import functools
+import os
+import threading
+import time
+
+ENV_VAR = "TAX_DASHBOARD_METRICS"
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # 초
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_SECONDS = "dashboard_request_duration_seconds"
+REQUESTS_TOTAL = "dashboard_requests_total"
+OPERATION_SECONDS = "dashboard_operation_duration_seconds"
+HELP = {
+    REQUEST_SECONDS: ("histogram", "라우트별 요청 처리 시간 (초)"),
+    REQUESTS_TOTAL: ("counter", "라우트·상태 코드별 요청 수"),
+    OPERATION_SECONDS: ("histogram", "내부 작업 시간 (초) — kind: scan | config | file_write | package"),
+}
+
+_enabled = os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+_lock = threading.Lock()
+_histograms = {}   # (이름, 라벨 튜플) → [버킷별 개수..., 합계, 개수]
+_counters = {}     # (이름, 라벨 튜플) → 값
+_local = threading.local()   # 진행 중인 요청의 작업별 시간 (Server-Timing용)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    """--metrics: 환경변수 없이 켜기 (init_app보다 먼저)."""
+    global _enabled
+    _enabled = True
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 기록
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def observe(name: str, seconds: float, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                series[i] += 1
+        series[-2] += seconds
+        series[-1] += 1
+
+
+def increment(name: str, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + 1
+
+
+def record(kind: str, op: str, seconds: float):
+    """내부 작업 시간 기록 — 요청 처리 중이면 그 요청의 Server-Timing에도 합산."""
+    observe(OPERATION_SECONDS, seconds, kind=kind, op=op)
+    spans = getattr(_local, "spans", None)
+    if spans is not None:
+        spans[op] = spans.get(op, 0.0) + seconds
+
+
+def timed(kind: str, op: str = None):
+    """
+    함수 실행 시간을 kind/op(기본: 함수 이름)으로 기록하는 데코레이터.
+    꺼져 있으면 플래그 확인 후 바로 원래 함수 호출.
+    """
+    def decorate(fn):
+        name = op or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(kind, name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Prometheus 텍스트 형식
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    """지금까지 기록한 값 → Prometheus 텍스트 형식 (버킷은 누적 개수)."""
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    for name, (kind, help_text) in HELP.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, pairs), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(pairs)} {value}")
+            continue
+        for (metric, pairs), series in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(BUCKETS, series):
+                lines.append(f"{name}_bucket{_labels(pairs + (('le', _number(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_labels(pairs + (('le', '+Inf'),))} {series[-1]}")
+            lines.append(f"{name}_sum{_labels(pairs)} {series[-2]:.6f}")
+            lines.append(f"{name}_count{_labels(pairs)} {series[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Flask 연결
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def server_timing(spans: dict, total: float) -> str:
+    """{작업: 초} → Server-Timing 헤더 값 (ms)."""
+    parts = [f"{op};dur={seconds * 1000:.2f}" for op, seconds in spans.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def init_app(app):
+    """켜져 있으면 요청 훅과 /api/metrics 등록 (여러 번 불러도 한 번만)."""
+    if not _enabled or "metrics" in app.extensions:
+        return
+    app.extensions["metrics"] = True
+
+    from flask import Response, request
+
+    @app.before_request
+    def _start_timer():
+        _local.spans = {}
+        _local.start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = getattr(_local, "start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        spans = _local.spans
+        _local.spans = _local.start = None
+
+        route = request.url_rule.rule if request.url_rule else "(unmatched)"
+        observe(REQUEST_SECONDS, elapsed, method=request.method, route=route)
+        increment(REQUESTS_TOTAL, method=request.method, route=route, status=str(response.status_code))
+        response.headers["Server-Timing"] = server_timing(spans, elapsed)
+        return response
+
+    @app.route("/api/metrics")
+    def api_metrics():
+        """계측 값 (Prometheus 텍스트 형식)"""
+        return Response(render(), content_type=CONTENT_TYPE)
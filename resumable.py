@@ -0,0 +1,218 @@
+"""
+이어받기(resumable) 업로드 세션
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+대용량 파일을 청크 단위로 나눠 올리고, 연결이 끊기면 받은 부분부터 이어서 올립니다.
+
+    1. create()   세션 생성 — 목적지 폴더에 임시파일(.part) 생성
+    2. write()    offset 위치에 청크 기록 (순서 무관, 병렬 가능)
+    3. finalize() 전체 수신 확인 → 해시 → 중복 확인 → rename (전체 파일 복사 없음)
+
+세션 정보는 input/.uploads/{id}.json에 저장되어 서버 재시작 후에도 이어받기 가능.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import metrics
+from paths import INPUT_DIR
+from uploads import CHUNK_SIZE, copy_stream, finish_upload, temp_path
+
+SESSION_DIR = INPUT_DIR / ".uploads"
+SESSION_TTL = 24 * 60 * 60  # 미완료 세션 보관 기간 (초)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 브라우저가 한 번에 보낼 청크 크기
+
+_lock = threading.Lock()
+_finalizing = set()  # finalize 진행 중인 세션 ID
+
+
+class SessionError(Exception):
+    """잘못된 세션 요청 (없는 세션, 범위 초과, 미완료 finalize 등)"""
+
+
+def _session_path(session_id: str) -> Path:
+    if not session_id.isalnum():
+        raise SessionError("잘못된 세션 ID")
+    return SESSION_DIR / f"{session_id}.json"
+
+
+def _load(session_id: str) -> dict:
+    try:
+        with open(_session_path(session_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise SessionError("업로드 세션이 없습니다 (만료되었거나 완료됨)")
+
+
+def _store(session: dict):
+    path = _session_path(session["id"])
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(session, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _merge(ranges: list, start: int, end: int) -> list:
+    """수신 구간 [start, end) 추가 후 겹치는 구간 병합."""
+    merged = []
+    for s, e in sorted(ranges + [[start, end]]):
+        if merged and s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return merged
+
+
+def _drop(session: dict):
+    """임시파일이 없어진 세션 정리 후 SessionError — 클라이언트는 새 세션으로 처음부터 다시 올림. _lock 보유 상태에서 호출."""
+    _session_path(session["id"]).unlink(missing_ok=True)
+    Path(session["part"]).unlink(missing_ok=True)
+    raise SessionError("업로드 임시파일이 없습니다 (삭제됨) — 처음부터 다시 올려주세요")
+
+
+def _received(session: dict) -> int:
+    return sum(e - s for s, e in session["ranges"])
+
+
+def public(session: dict) -> dict:
+    """API 응답용 세션 정보."""
+    return {
+        "session_id": session["id"],
+        "filename": session["filename"],
+        "size": session["size"],
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+        "received": session["ranges"],
+        "received_bytes": _received(session),
+        "complete": session["ranges"] == [[0, session["size"]]] or session["size"] == 0,
+    }
+
+
+def cleanup_expired():
+    """TTL이 지난 미완료 세션과 임시파일 삭제."""
+    if not SESSION_DIR.exists():
+        return
+    now = time.time()
+    for path in SESSION_DIR.glob("*.json"):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if now - session.get("updated", 0) > SESSION_TTL:
+            Path(session["part"]).unlink(missing_ok=True)
+            path.unlink(missing_ok=True)
+
+
+def create(directory: Path, prefix: str, stem: str, ext: str, filename: str, size: int, label: str = "") -> dict:
+    """세션 생성 — 목적지 폴더에 최종 크기의 임시파일을 미리 만듦 (label: 응답 메시지용 표시명)."""
+    SESSION_DIR.mkdir(exist_ok=True)
+    cleanup_expired()
+
+    session_id = uuid.uuid4().hex
+    part = temp_path(directory, f"{prefix}_{stem}{ext}")
+    with open(part, "wb") as f:
+        f.truncate(size)
+
+    session = {
+        "id": session_id,
+        "directory": str(directory),
+        "prefix": prefix,
+        "stem": stem,
+        "ext": ext,
+        "filename": filename,
+        "label": label,
+        "size": size,
+        "part": str(part),
+        "ranges": [],
+        "updated": time.time(),
+    }
+    with _lock:
+        _store(session)
+    return session
+
+
+def get(session_id: str) -> dict:
+    with _lock:
+        return _load(session_id)
+
+
+@metrics.timed("file_write", "upload_chunk")
+def write(session_id: str, offset: int, stream, length: int) -> dict:
+    """
+    offset 위치에 청크 기록.
+
+    Args:
+        length: 청크 길이 (Content-Length) — 파일 크기를 넘으면 SessionError
+    """
+    with _lock:
+        session = _load(session_id)
+        if session_id in _finalizing:
+            raise SessionError("이미 저장 중인 업로드입니다")
+    if offset < 0 or length is None or offset + length > session["size"]:
+        raise SessionError("청크 범위가 파일 크기를 벗어났습니다")
+
+    # 청크 기록은 잠금 없이 — 서로 다른 구간은 병렬로 기록
+    try:
+        with open(session["part"], "r+b") as f:
+            f.seek(offset)
+            written = copy_stream(stream, f, max_size=length)
+    except FileNotFoundError:
+        with _lock:
+            _drop(session)
+
+    with _lock:
+        session = _load(session_id)
+        session["ranges"] = _merge(session["ranges"], offset, offset + written)
+        session["updated"] = time.time()
+        _store(session)
+    return session
+
+
+def abort(session_id: str):
+    with _lock:
+        session = _load(session_id)
+        Path(session["part"]).unlink(missing_ok=True)
+        _session_path(session_id).unlink(missing_ok=True)
+
+
+@metrics.timed("file_write", "upload_finalize")
+def finalize(session_id: str) -> dict:
+    """
+    전체 수신 확인 후 최종 저장 (반환값은 uploads.finish_upload와 동일).
+    세션 파일은 저장이 끝난 뒤에 지움 — 도중에 실패해도 세션이 남아 같은 ID로 다시 요청 가능
+    (임시파일까지 없어졌으면 SessionError로 정리되어 클라이언트가 새로 시작).
+    """
+    with _lock:
+        session = _load(session_id)
+        if not public(session)["complete"]:
+            raise SessionError(
+                f"아직 받지 못한 부분이 있습니다 ({_received(session):,}/{session['size']:,} bytes)"
+            )
+        if session_id in _finalizing:
+            raise SessionError("이미 저장 중인 업로드입니다")
+        _finalizing.add(session_id)
+
+    try:
+        part = Path(session["part"])
+        hasher = hashlib.sha256()
+        try:
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+        except OSError:
+            with _lock:
+                _drop(session)
+
+        saved = finish_upload(
+            part, hasher.hexdigest(), session["size"], Path(session["directory"]),
+            session["prefix"], session["stem"], session["ext"],
+        )
+        with _lock:
+            _session_path(session_id).unlink(missing_ok=True)
+        return saved
+    finally:
+        with _lock:
+            _finalizing.discard(session_id)
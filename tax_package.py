@@ -343,17 +343,28 @@ def create_corp_checklist(year):
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 카톡 메시지 생성
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def create_kakao_message(tax_type, period):
+MESSAGE_EXTENSIONS = ['.xlsx', '.xls', '.pdf', '.csv']  # 수집 완료로 나열할 파일
+
+
+def create_kakao_message(tax_type, period, collected=None):
+    """
+    세무사 전달용 카톡 메시지
+
+    Args:
+        collected: 부가세 분기 폴더의 MESSAGE_EXTENSIONS 파일명 목록
+                   (이미 스캔한 결과 재사용, None이면 input 폴더를 직접 확인)
+    """
     cfg = load_config()
-    if tax_type == "vat":
+    if tax_type == "vat" and collected is None:
         # input 폴더에서 수집된 파일 확인
         input_subdir = INPUT_DIR / period
         collected = []
         if input_subdir.exists():
             for f in input_subdir.iterdir():
-                if f.suffix in ['.xlsx', '.xls', '.pdf', '.csv']:
+                if f.suffix in MESSAGE_EXTENSIONS:
                     collected.append(f.name)
 
+    if tax_type == "vat":
         lines = [
             f"[{cfg['company_name']}] {period} 부가세 자료",
             "=" * 30,
@@ -0,0 +1,150 @@
+"""
+업로드 API 테스트 (python -m pytest) — 중복 감지·하드링크 재사용, 이어받기 세션
+"""
+import os
+
+import pytest
+
+import app as dashboard
+import events
+import hash_store
+import resumable
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """input/을 임시 폴더로 바꾼 테스트 클라이언트 (해시 저장소·세션도 임시 폴더 기준)."""
+    monkeypatch.setattr(dashboard, "INPUT_DIR", tmp_path)
+    monkeypatch.setattr(events, "INPUT_DIR", tmp_path)
+    monkeypatch.setattr(hash_store, "INPUT_DIR", tmp_path)
+    monkeypatch.setattr(hash_store, "STORE_PATH", tmp_path / ".hashstore.json")
+    monkeypatch.setattr(hash_store, "_store", None)
+    monkeypatch.setattr(resumable, "SESSION_DIR", tmp_path / ".uploads")
+    return dashboard.app.test_client()
+
+
+def put_file(client, platform_id, quarter, filename, data):
+    return client.put(
+        f"/api/upload/{platform_id}?quarter={quarter}&filename={filename}", data=data,
+    )
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 중복 업로드
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def test_duplicate_upload_returns_409(client, tmp_path):
+    first = put_file(client, "coupang", "2026Q1", "정산.xlsx", b"same content")
+    assert first.status_code == 200
+
+    second = put_file(client, "coupang", "2026Q1", "정산_다시.xlsx", b"same content")
+    assert second.status_code == 409
+    body = second.get_json()
+    assert body["duplicate"] is True
+    assert body["existing"] == first.get_json()["filename"]
+    assert [f.name for f in (tmp_path / "2026Q1").iterdir()] == [body["existing"]]
+
+
+def test_duplicate_of_unregistered_file(client, tmp_path):
+    """저장소에 없는 기존 파일(셀러센터 다운로드 등)도 같은 내용이면 중복."""
+    q_dir = tmp_path / "2026Q1"
+    q_dir.mkdir()
+    (q_dir / "쿠팡_다운로드.xlsx").write_bytes(b"downloaded")
+
+    res = put_file(client, "coupang", "2026Q1", "정산.xlsx", b"downloaded")
+    assert res.status_code == 409
+    assert res.get_json()["existing"] == "쿠팡_다운로드.xlsx"
+
+
+def test_same_content_in_other_folder_is_hard_linked(client, tmp_path):
+    first = put_file(client, "coupang", "2026Q1", "정산.xlsx", b"shared content")
+    second = put_file(client, "coupang", "2026Q2", "정산.xlsx", b"shared content")
+    assert (first.status_code, second.status_code) == (200, 200)
+
+    a = tmp_path / "2026Q1" / first.get_json()["filename"]
+    b = tmp_path / "2026Q2" / second.get_json()["filename"]
+    assert b.read_bytes() == b"shared content"
+    assert os.stat(a).st_ino == os.stat(b).st_ino
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 이어받기 업로드
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def start_session(client, data, filename="big.zip"):
+    res = client.post("/api/upload-sessions", json={
+        "type": "vat", "id": "coupang", "period": "2026Q1", "filename": filename, "size": len(data),
+    })
+    assert res.status_code == 200
+    return res.get_json()["session_id"]
+
+
+def put_chunk(client, session_id, data, start, end):
+    return client.put(f"/api/upload-sessions/{session_id}?offset={start}", data=data[start:end])
+
+
+def test_chunks_out_of_order_and_overlapping(client, tmp_path):
+    data = bytes(range(200)) * 5
+    session_id = start_session(client, data)
+
+    for start, end in [(600, 1000), (0, 300), (250, 650)]:   # 역순 + 겹침
+        assert put_chunk(client, session_id, data, start, end).status_code == 200
+
+    status = client.get(f"/api/upload-sessions/{session_id}").get_json()
+    assert status["received"] == [[0, 1000]]
+    assert status["complete"] is True
+
+    res = client.post(f"/api/upload-sessions/{session_id}/finalize")
+    assert res.status_code == 200
+    assert (tmp_path / "2026Q1" / res.get_json()["filename"]).read_bytes() == data
+    assert client.get(f"/api/upload-sessions/{session_id}").status_code == 400   # 완료된 세션은 정리
+
+
+def test_chunk_beyond_size_rejected(client):
+    session_id = start_session(client, b"0123456789")
+    res = client.put(f"/api/upload-sessions/{session_id}?offset=8", data=b"89X")
+    assert res.status_code == 400
+
+
+def test_finalize_incomplete_session(client):
+    data = b"0123456789"
+    session_id = start_session(client, data)
+    put_chunk(client, session_id, data, 0, 4)
+
+    res = client.post(f"/api/upload-sessions/{session_id}/finalize")
+    assert res.status_code == 400
+    assert "4/10" in res.get_json()["message"]
+
+    # 세션은 남아 있어 나머지를 올리고 다시 finalize 가능
+    assert put_chunk(client, session_id, data, 4, 10).status_code == 200
+    assert client.post(f"/api/upload-sessions/{session_id}/finalize").status_code == 200
+
+
+def test_delete_during_upload_keeps_part_file(client, tmp_path):
+    """항목 전체 삭제가 진행 중인 업로드의 임시파일(.part)을 지우지 않음."""
+    data = b"0123456789"
+    put_file(client, "coupang", "2026Q1", "기존.xlsx", b"existing")
+    session_id = start_session(client, data)
+    put_chunk(client, session_id, data, 0, 5)
+
+    res = client.delete("/api/delete/coupang?quarter=2026Q1")
+    assert res.get_json()["deleted"] == ["쿠팡_기존.xlsx"]
+
+    assert put_chunk(client, session_id, data, 5, 10).status_code == 200
+    res = client.post(f"/api/upload-sessions/{session_id}/finalize")
+    assert res.status_code == 200
+    assert (tmp_path / "2026Q1" / res.get_json()["filename"]).read_bytes() == data
+
+
+@pytest.mark.parametrize("step", ["write", "finalize"])
+def test_missing_part_file_is_client_error(client, step):
+    data = b"0123456789"
+    session_id = start_session(client, data)
+    if step == "finalize":
+        put_chunk(client, session_id, data, 0, 10)
+    os.unlink(resumable.get(session_id)["part"])
+
+    if step == "write":
+        res = put_chunk(client, session_id, data, 0, 10)
+    else:
+        res = client.post(f"/api/upload-sessions/{session_id}/finalize")
+    assert res.status_code == 400
+    assert client.get(f"/api/upload-sessions/{session_id}").status_code == 400   # 세션 정리 → 새로 시작
@@ -0,0 +1,259 @@
+"""
+vat_checker 테스트 (python -m pytest)
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import vat_checker
+from vat_checker import classify_workbook, discover_inputs
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 파일 분류·탐색
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@pytest.mark.parametrize("name, source, direction, score", [
+    ("ecount_매출.xlsx", "ecount", "매출", 2),
+    ("홈택스_매입.xlsx", "hometax", "매입", 2),
+    ("이카운트_전자세금계산서_매출.xlsx", "ecount", "매출", 2),   # 브랜드명이 일반 용어보다 우선
+    ("홈택스_전자세금계산서_매출.xlsx", "hometax", "매출", 2),
+    ("전자세금계산서_매입.xlsx", "hometax", "매입", 1),
+    ("매출장.xlsx", "ecount", "매출", 0),
+])
+def test_classify_source(name, source, direction, score):
+    info = classify_workbook(name)
+    assert (info["source"], info["direction"], info["score"]) == (source, direction, score)
+
+
+@pytest.mark.parametrize("name", [
+    "쿠팡_매출정산내역.xlsx",       # 쇼핑몰 업로드 파일
+    "스마트스토어_202601_매출.xlsx",
+    "ecount_홈택스_매출.xlsx",       # 두 출처 브랜드명
+    "ecount_매출_매입.xlsx",         # 구분 둘 다
+    "ecount_정산.xlsx",              # 구분 없음
+])
+def test_classify_rejects(name):
+    assert classify_workbook(name) is None
+
+
+def test_classify_period():
+    assert classify_workbook("ecount_매출_2026Q1.xlsx")["quarter"] == 1
+    info = classify_workbook("홈택스_매입_2026년 5월.xlsx")
+    assert (info["year"], info["quarter"], info["month"]) == (2026, 2, 5)
+
+
+def _touch(path, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def input_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(vat_checker, "INPUT_DIR", tmp_path)
+    vat_checker._discovery_cache.clear()
+    return tmp_path
+
+
+def test_discover_ignores_platform_uploads(input_dir):
+    _touch(input_dir / "ecount_매출.xlsx", 1_000)
+    _touch(input_dir / "2026Q1" / "쿠팡_매출정산내역.xlsx", 2_000)
+    _touch(input_dir / "2026Q1" / "매출자료.xlsx", 2_000)   # 분기 폴더: 출처 키워드 없으면 제외
+
+    selected, _ = discover_inputs("2026Q1")
+    assert selected == {("ecount", "매출"): [input_dir / "ecount_매출.xlsx"]}
+
+
+def test_discover_ranks_source_score_before_quarter(input_dir):
+    _touch(input_dir / "홈택스_매출.xlsx", 1_000)
+    _touch(input_dir / "2026Q1" / "세금계산서_매출.xlsx", 2_000)   # 분기 표시지만 일반 용어뿐
+    _touch(input_dir / "매입장_2026Q1.xlsx", 2_000)
+    _touch(input_dir / "ecount_매입.xlsx", 1_000)
+
+    selected, _ = discover_inputs("2026Q1")
+    assert selected[("hometax", "매출")] == [input_dir / "홈택스_매출.xlsx"]
+    assert selected[("ecount", "매입")] == [input_dir / "ecount_매입.xlsx"]
+
+
+def test_discover_quarter_and_months(input_dir):
+    _touch(input_dir / "ecount_매출.xlsx", 3_000)
+    _touch(input_dir / "ecount_매출_2026Q1.xlsx", 1_000)     # 같은 점수면 분기 표시 우선
+    _touch(input_dir / "ecount_매출_2025Q4.xlsx", 4_000)     # 다른 분기 제외
+    _touch(input_dir / "홈택스_매입_202602.xlsx", 1_000)
+    _touch(input_dir / "홈택스_매입_202601.xlsx", 1_000)
+    _touch(input_dir / "홈택스_매입_202604.xlsx", 1_000)
+
+    selected, _ = discover_inputs("2026Q1")
+    assert selected[("ecount", "매출")] == [input_dir / "ecount_매출_2026Q1.xlsx"]
+    assert selected[("hometax", "매입")] == [
+        input_dir / "홈택스_매입_202601.xlsx", input_dir / "홈택스_매입_202602.xlsx",
+    ]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 금액 정규화·거래처별 대조
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@pytest.mark.parametrize("values", [
+    ["1,234원", " 5 000 ", 12.7, None, "abc", -300, "1,000.9", ""],
+    [1500, 2000.9, -3.2, float("nan")],
+])
+def test_normalize_amounts_matches_scalar(values):
+    series = pd.Series(values)
+    assert vat_checker.normalize_amounts(series).tolist() == [vat_checker.normalize_amount(v) for v in values]
+
+
+def _baseline_partner(ec, ht):
+    """이전 구현 (거래처별 apply + 딕셔너리 순회) — 벡터화 대조와 결과 비교용."""
+    ec_grouped = ec.groupby("사업자번호")["공급가액"].apply(
+        lambda x: x.apply(vat_checker.normalize_amount).sum()).to_dict()
+    ht_grouped = ht.groupby("등록번호")["공급가액"].apply(
+        lambda x: x.apply(vat_checker.normalize_amount).sum()).to_dict()
+    missing_ht, missing_ec, mismatch = {}, {}, {}
+    for key in set(ec_grouped) | set(ht_grouped):
+        ec_val, ht_val = ec_grouped.get(key, 0), ht_grouped.get(key, 0)
+        if ec_val > 0 and ht_val == 0:
+            missing_ht[key] = ec_val
+        elif ec_val == 0 and ht_val > 0:
+            missing_ec[key] = ht_val
+        elif abs(ec_val - ht_val) > 1:
+            mismatch[key] = (ec_val, ht_val, ec_val - ht_val)
+    return missing_ht, missing_ec, mismatch
+
+
+def test_partner_mode_matches_baseline():
+    rng = np.random.default_rng(7)
+    biz = [str(1_000_000_000 + i) for i in range(60)]
+
+    def frame(rows, key_col):
+        amounts = rng.integers(-50_000, 2_000_000, rows)
+        return pd.DataFrame({
+            "일자": ["2026-01-05"] * rows,
+            key_col: rng.choice(biz, rows),
+            "공급가액": [f"{a:,}원" if i % 3 else int(a) for i, a in enumerate(amounts)],
+        })
+
+    ec = frame(500, "사업자번호")
+    ht = frame(450, "등록번호")
+    ht.loc[ht["등록번호"] == biz[0], "공급가액"] = 0         # 홈택스 합계 0 → 홈택스 누락
+    ht = ht[ht["등록번호"] != biz[1]]                          # 홈택스에 없음
+
+    res = vat_checker.compare_data(ec, ht, "매출")
+    missing_ht, missing_ec, mismatch = _baseline_partner(ec, ht)
+
+    assert res["ecount_total"] == ec["공급가액"].map(vat_checker.normalize_amount).sum()
+    assert res["hometax_total"] == ht["공급가액"].map(vat_checker.normalize_amount).sum()
+    assert dict(zip(res["missing_in_hometax"]["거래처"], res["missing_in_hometax"]["이카운트금액"])) == missing_ht
+    assert dict(zip(res["missing_in_ecount"]["거래처"], res["missing_in_ecount"]["홈택스금액"])) == missing_ec
+    found = res["amount_mismatch"]
+    assert {k: (a, b, d) for k, a, b, d in found[["거래처", "이카운트", "홈택스", "차이"]].itertuples(index=False)} \
+        == mismatch
+    assert biz[0] in missing_ht and biz[1] in missing_ht
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 세금계산서(라인) 단위 대조
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _lines(rows):
+    """[(일자, 사업자번호, 전표번호, 공급가액)] → invoice_lines 결과"""
+    df = pd.DataFrame(rows, columns=["일자", "사업자번호", "전표번호", "공급가액"])
+    df["세액"] = df["공급가액"] // 10
+    colmap = vat_checker.map_columns(df)
+    return vat_checker.invoice_lines(df, colmap, vat_checker.normalize_amounts(df["공급가액"]))
+
+
+def test_pair_exact_by_slip_and_duplicate_keys():
+    ec = _lines([("2026-01-05", "111", "A-1", 1000), ("2026-01-05", "111", None, 500),
+                 ("2026-01-05", "111", None, 500)])
+    ht = _lines([("2026-01-05", "111", "A1", 1200), ("2026-01-05", "111", None, 500)])
+
+    pairs, ec_left, ht_left = vat_checker._pair_exact(ec, ht, ["slip"], "전표번호")
+    assert pairs[["row_ec", "row_ht"]].values.tolist() == [[0, 0]]     # "A-1" ↔ "A1"
+
+    pairs, ec_left, ht_left = vat_checker._pair_exact(
+        ec_left, ht_left, ["date", "biz", "supply", "tax"], "일자+사업자+금액")
+    assert pairs[["row_ec", "row_ht"]].values.tolist() == [[1, 1]]     # 같은 키는 등장 순서대로 1:1
+    assert ec_left["row"].tolist() == [2] and ht_left.empty
+
+
+def test_pair_nearest_respects_tolerances():
+    ec = _lines([("2026-01-05", "111", None, 10_000), ("2026-01-05", "111", None, 50_000),
+                 ("2026-01-05", "222", None, 20_000), ("2026-01-05", "333", None, 30_000)])
+    ht = _lines([("2026-01-08", "111", None, 10_400),    # 400원·3일 차이 → 짝
+                 ("2026-01-05", "111", None, 52_000),    # 2,000원 차이 → 제외
+                 ("2026-02-01", "222", None, 20_000),    # 27일 차이 → 제외
+                 ("2026-01-05", "444", None, 30_000)])   # 사업자번호 다름 → 제외
+
+    pairs, ec_left, ht_left = vat_checker._pair_nearest(ec, ht, amount_tolerance=1000, date_tolerance=7)
+    assert pairs[["row_ec", "row_ht"]].values.tolist() == [[0, 0]]
+    assert sorted(ec_left["row"]) == [1, 2, 3] and sorted(ht_left["row"]) == [1, 2, 3]
+
+    pairs, _, _ = vat_checker._pair_nearest(ec, ht, amount_tolerance=3000, date_tolerance=30)
+    assert sorted(pairs[["row_ec", "row_ht"]].values.tolist()) == [[0, 0], [1, 1], [2, 2]]
+
+
+def test_invoice_mode_reports_each_kind():
+    ec = pd.DataFrame({
+        "일자": ["2026-01-05", "2026-01-06", "2026-01-07"],
+        "사업자번호": ["123-45-67890"] * 3,
+        "전표번호": ["S1", "S2", "S3"],
+        "공급가액": ["10,000", "20,000", "30,000"],
+    })
+    ht = pd.DataFrame({
+        "작성일자": ["20260105", "20260106", "20260109"],
+        "등록번호": ["1234567890"] * 3,
+        "승인번호": ["S1", "S2", "S9"],
+        "공급가액": [10_000, 21_000, 99_000],
+    })
+    res = vat_checker.compare_data(ec, ht, "매출", mode="invoice")
+    assert res["missing_in_hometax"]["전표번호"].tolist() == ["S3"]
+    assert res["missing_in_ecount"]["전표번호"].tolist() == ["S9"]
+    assert res["amount_mismatch"][["전표번호(이카운트)", "불일치", "공급가액 차이"]].values.tolist() \
+        == [["S2", "공급가액", -1000]]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 여러 분기 일괄 대조
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def test_quarter_range_crosses_year():
+    assert vat_checker.quarter_range("2025Q3", "2026Q2") == ["2025Q3", "2025Q4", "2026Q1", "2026Q2"]
+    assert vat_checker.quarter_range("2026Q1", "2026Q1") == ["2026Q1"]
+
+
+def test_partition_by_quarter():
+    df = pd.DataFrame({
+        "일자": ["2025-12-31", "2026/01/01", "20260331", "2026-04-01", None, "날짜 없음"],
+        "공급가액": [1, 2, 3, 4, 5, 6],
+    })
+    parts, undated = vat_checker.partition_by_quarter(df, ["2025Q4", "2026Q1"])
+    assert {q: part["공급가액"].tolist() for q, part in parts.items()} == {"2025Q4": [1], "2026Q1": [2, 3]}
+    assert undated == 2
+
+    assert vat_checker.partition_by_quarter(pd.DataFrame({"공급가액": [1]}), ["2026Q1"]) == (None, 0)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 리포트
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def test_create_report_writes_rows_with_number_formats(tmp_path, monkeypatch):
+    from openpyxl import load_workbook
+
+    monkeypatch.setattr(vat_checker, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(vat_checker, "REPORT_CHUNK_ROWS", 2)   # 여러 청크로 나눠 기록되는지
+    ec = pd.DataFrame({"사업자번호": ["1", "2", "3", "4", "5"], "공급가액": [100, 200, 300, 400, 500]})
+    ht = pd.DataFrame({"등록번호": ["1", "2", "3", "4"], "공급가액": [100, 250, 330, 444]})
+    sell = vat_checker.compare_data(ec, ht, "매출")
+    buy = vat_checker.compare_data(None, None, "매입")
+
+    path = vat_checker.create_report(sell, buy, "2026Q1")
+    assert path == tmp_path / "부가세체크_2026Q1.xlsx"
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["요약", "매출_불일치", "매입_불일치"]
+    rows = list(wb["매출_불일치"].iter_rows(values_only=True))
+    mismatch = rows[rows.index(next(r for r in rows if str(r[0]).startswith("금액 불일치"))) + 2:]
+    assert [r[:4] for r in mismatch] == [("2", 200, 250, -50), ("3", 300, 330, -30), ("4", 400, 444, -44)]
+    assert wb["매출_불일치"].cell(row=3, column=2).number_format == "#,##0"
+    assert "✅ 불일치 항목 없음" in [r[0] for r in wb["매입_불일치"].iter_rows(values_only=True)]
@@ -0,0 +1,165 @@
+"""
+업로드 파일 저장 모듈
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+업로드 스트림을 고정 크기 청크로 목적지 폴더에 바로 기록합니다.
+
+- 기록하면서 SHA-256 계산
+- 최대 크기 초과 시 RequestEntityTooLarge (413)
+- 임시파일(.part)에 쓴 뒤 rename → 쓰다 만 파일이 현황 스캔에 잡히지 않음
+- 같은 폴더·같은 항목에 동일 내용 파일이 있으면 저장하지 않고 기존 파일을 알려줌
+- 다른 폴더에 동일 내용 파일이 있으면 복사본 대신 하드링크로 저장
+"""
+import hashlib
+import os
+import threading
+import uuid
+import zipfile
+from pathlib import Path
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+import hash_store
+import metrics
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+_name_lock = threading.Lock()
+
+
+def temp_path(directory: Path, name: str) -> Path:
+    """같은 폴더의 임시파일 경로 (숨김 + .part 확장자라 스캔 대상 아님)."""
+    return Path(directory) / f".{name}.{uuid.uuid4().hex[:8]}.part"
+
+
+def copy_stream(stream, fp, hasher=None, max_size=None, written=0) -> int:
+    """
+    stream → fp 청크 복사.
+
+    Args:
+        stream: read(n)을 지원하는 입력 스트림
+        fp: 쓰기용 파일 객체
+        hasher: hashlib 객체 (있으면 기록하면서 갱신)
+        max_size: 최대 누적 바이트 (None이면 제한 없음)
+        written: 이미 기록된 바이트 (이어쓰기 시 누적 제한 계산용)
+
+    Returns:
+        int: 이번에 기록한 바이트 수
+    """
+    total = 0
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if max_size is not None and written + total > max_size:
+            raise RequestEntityTooLarge()
+        if hasher is not None:
+            hasher.update(chunk)
+        fp.write(chunk)
+    return total
+
+
+def unique_name(directory: Path, prefix: str, stem: str, ext: str) -> str:
+    """{prefix}_{stem}{ext} — 동일 파일명 존재 시 번호 부여."""
+    save_name = f"{prefix}_{stem}{ext}"
+    counter = 1
+    while (Path(directory) / save_name).exists():
+        save_name = f"{prefix}_{stem}_{counter}{ext}"
+        counter += 1
+    return save_name
+
+
+def commit_file(tmp: Path, directory: Path, prefix: str, stem: str, ext: str) -> Path:
+    """임시파일을 최종 이름으로 rename (이름 선택과 rename을 원자적으로)."""
+    with _name_lock:
+        save_path = Path(directory) / unique_name(directory, prefix, stem, ext)
+        os.replace(tmp, save_path)
+    return save_path
+
+
+def dedupe(tmp: Path, sha256: str, size: int, directory: Path, prefix: str):
+    """
+    동일 내용 파일 확인.
+
+    Returns:
+        tuple: (같은 폴더·항목의 기존 파일 또는 None, 저장할 임시파일 경로)
+               다른 폴더에 같은 파일이 있으면 임시파일을 그 파일의 하드링크로 교체
+    """
+    existing = hash_store.find(sha256, size, directory)
+    directory = Path(directory).resolve()
+    for path in existing:
+        if path.resolve().parent == directory and prefix in path.name:
+            return path, tmp
+    for path in existing:
+        link = temp_path(directory, path.name)
+        try:
+            os.link(path, link)
+        except OSError:
+            continue  # 하드링크 미지원 파일시스템 — 복사본 그대로 사용
+        tmp.unlink()
+        return None, link
+    return None, tmp
+
+
+def finish_upload(tmp: Path, sha256: str, size: int, directory: Path, prefix: str, stem: str, ext: str) -> dict:
+    """
+    다 쓴 임시파일을 중복 확인 후 최종 이름으로 저장.
+
+    Returns:
+        dict: {"path": Path, "size": int, "sha256": str, "duplicate": bool}
+              duplicate=True면 저장하지 않았고 path는 기존 파일
+    """
+    try:
+        duplicate, tmp = dedupe(tmp, sha256, size, directory, prefix)
+        if duplicate is not None:
+            tmp.unlink()
+            return {"path": duplicate, "size": size, "sha256": sha256, "duplicate": True}
+        save_path = commit_file(tmp, directory, prefix, stem, ext)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    hash_store.add(save_path, sha256)
+    return {"path": save_path, "size": size, "sha256": sha256, "duplicate": False}
+
+
+@metrics.timed("file_write")
+def save_stream(stream, directory: Path, prefix: str, stem: str, ext: str, max_size=None) -> dict:
+    """업로드 스트림을 폴더에 원자적으로 저장 (반환값은 finish_upload와 동일)."""
+    tmp = temp_path(directory, f"{prefix}_{stem}{ext}")
+    hasher = hashlib.sha256()
+    try:
+        with open(tmp, "wb") as fp:
+            size = copy_stream(stream, fp, hasher, max_size)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return finish_upload(tmp, hasher.hexdigest(), size, directory, prefix, stem, ext)
+
+
+def zip_member_name(info: zipfile.ZipInfo) -> str:
+    """ZIP 항목 파일명 (UTF-8 플래그가 없으면 윈도우 한글(cp949)로 해석)."""
+    name = info.filename
+    if not info.flag_bits & 0x800:
+        try:
+            name = name.encode("cp437").decode("cp949")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+    return Path(name).name
+
+
+def iter_zip_members(fileobj):
+    """
+    ZIP 안의 파일을 (파일명, 스트림)으로 순회 (폴더·숨김파일 제외).
+
+    Raises:
+        zipfile.BadZipFile: ZIP이 아니거나 손상된 경우
+    """
+    with zipfile.ZipFile(fileobj) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                continue
+            name = zip_member_name(info)
+            if not name or name.startswith("."):
+                continue
+            with zf.open(info) as stream:
+                yield name, stream
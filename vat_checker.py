@@ -6,6 +6,7 @@
 
 사용법:
     python3 vat_checker.py --quarter 2026Q1
+    python3 vat_checker.py --quarter 2026Q1 --mode invoice   (세금계산서 건별 대조)
 
 입력 파일 (input/ 폴더에 넣기):
     - ecount_매출.xlsx  (이카운트 매출장 내보내기)
@@ -20,13 +21,28 @@
 import os
 import sys
 import argparse
+import json
+import re
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from excel_reader import match_headers, read_table
+from file_index import list_files, version as index_version
 from paths import INPUT_DIR, OUTPUT_DIR
+from tax_package import PLATFORMS
+from vat_constants import QUARTER_PATTERN
+import workbook_cache
+from workbook_cache import load_cached
 
 OUTPUT_DIR.mkdir(exist_ok=True)
 
@@ -34,31 +50,246 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 1. 엑셀 파일 자동 감지 및 로딩
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def find_file(keyword):
-    """input 폴더에서 키워드가 포함된 엑셀 파일 찾기"""
-    for f in INPUT_DIR.glob("*.xlsx"):
-        if keyword in f.name.lower() or keyword in f.stem.lower():
-            return f
-    for f in INPUT_DIR.glob("*.xls"):
-        if keyword in f.name.lower() or keyword in f.stem.lower():
-            return f
-    return None
+WORKBOOK_EXTENSIONS = (".xlsx", ".xls")
+
+# 파일명 키워드 → 출처. 브랜드명이 하나라도 있으면 브랜드명으로만 판단 (점수 2),
+# 없을 때만 일반 용어로 판단 (점수 1) — "이카운트_전자세금계산서_매출"은 이카운트
+SOURCE_BRANDS = {
+    "ecount": ("ecount", "이카운트"),
+    "hometax": ("hometax", "홈택스"),
+}
+SOURCE_TERMS = {
+    "hometax": ("세금계산서",),
+}
+DIRECTION_KEYWORDS = {
+    "매출": ("매출", "sell", "sales"),
+    "매입": ("매입", "buy", "purchase"),
+}
+# 대시보드 쇼핑몰 업로드 파일명 접두어 (예: 쿠팡_매출정산내역.xlsx) — 대조 자료가 아님
+PLATFORM_PREFIXES = tuple(f"{p['filename']}_".lower() for p in PLATFORMS)
+
+_QUARTER_RE = re.compile(r"(20\d{2})\s*[-_.]?\s*(?:q([1-4])|([1-4])\s*분기)")
+_MONTH_RE = re.compile(r"(20\d{2})(?:\s*[-_.]?\s*(0[1-9]|1[0-2])(?!\d)|\s*년\s*(1[0-2]|0?[1-9])\s*월)")
+_YEAR_RE = re.compile(r"(?<!\d)(20\d{2})(?!\d)")
+
+
+@lru_cache(maxsize=4096)
+def classify_workbook(name):
+    """
+    파일명 → 출처 × 구분 × 기간 분류 (출처·구분을 알 수 없으면 None).
+
+    출처 키워드가 없고 매출/매입만 있으면 이카운트로 간주 (점수 0).
+    쇼핑몰 업로드 파일(플랫폼명_...)은 None.
+
+    Returns:
+        dict: {"source", "direction", "score", "year", "quarter", "month"}
+    """
+    stem = Path(name).stem.lower()
+    if stem.startswith(PLATFORM_PREFIXES):
+        return None
+
+    brands = [s for s, keywords in SOURCE_BRANDS.items() if any(k in stem for k in keywords)]
+    terms = [s for s, keywords in SOURCE_TERMS.items() if any(k in stem for k in keywords)]
+    if brands:
+        leaders, best = brands, 2
+    elif terms:
+        leaders, best = terms, 1
+    else:
+        leaders, best = ["ecount"], 0
+    if len(leaders) != 1:
+        return None  # 두 출처의 키워드가 함께 있음 — 판단 불가
+    source = leaders[0]
+
+    directions = [d for d, keywords in DIRECTION_KEYWORDS.items() if any(k in stem for k in keywords)]
+    if len(directions) != 1:
+        return None
+
+    year = quarter = month = None
+    m = _QUARTER_RE.search(stem)
+    if m:
+        year, quarter = int(m.group(1)), int(m.group(2) or m.group(3))
+    else:
+        m = _MONTH_RE.search(stem)
+        if m:
+            year, month = int(m.group(1)), int(m.group(2) or m.group(3))
+            quarter = (month - 1) // 3 + 1
+        else:
+            m = _YEAR_RE.search(stem)
+            if m:
+                year = int(m.group(1))
+
+    return {
+        "source": source, "direction": directions[0], "score": best,
+        "year": year, "quarter": quarter, "month": month,
+    }
 
 
-def load_excel(filepath):
-    """엑셀 파일 로딩 — 컬럼명 자동 감지"""
+def _workbook_dirs(quarter):
+    """
+    탐색 폴더: input/ 및 input/{분기}/ (분기 폴더 파일은 그 분기 자료로 취급).
+    분기 폴더는 대시보드 쇼핑몰 업로드 폴더이기도 해서 출처 키워드가 있는 파일만 인식.
+    """
+    return [(INPUT_DIR, None), (INPUT_DIR / quarter, quarter)]
+
+
+_discovery_cache = {}  # (분기, 폴더 버전들) → 결과
+
+
+def discover_inputs(quarter):
+    """
+    input/ 폴더를 한 번 읽어 출처(ecount/hometax) × 구분(매출/매입)별 파일 선택.
+
+    같은 출처·구분 안에서:
+        1. 해당 분기 자료만 (다른 분기·연도로 표시된 파일 제외)
+        2. 월별 파일이 있으면 월마다 최신 1개씩 모두 (분할 내보내기)
+        3. 없으면 출처 점수 → 분기 표시 여부 → 최신순으로 1개
+
+    Returns:
+        tuple: ({(source, direction): [Path, ...]}, 전체 엑셀 파일 [Path])
+    """
+    year, q = int(quarter[:4]), int(quarter[-1])
+    dirs = _workbook_dirs(quarter)
+    cache_key = (quarter, tuple(index_version(d)[0] for d, _ in dirs))
+    cached = _discovery_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    all_files = []
+    candidates = {}
+    for directory, dir_quarter in dirs:
+        for f in list_files(directory):
+            if f["suffix"] not in WORKBOOK_EXTENSIONS or f["name"].startswith("~$"):
+                continue  # 엑셀이 열려 있을 때 생기는 잠금 파일 제외
+            path = directory / f["name"]
+            all_files.append(path)
+            info = classify_workbook(f["name"])
+            if info is None or (dir_quarter is not None and info["score"] == 0):
+                continue  # 분기 폴더에서는 출처 키워드 없는 파일(쇼핑몰 자료 등) 제외
+            if dir_quarter is not None and info["quarter"] is None:
+                info = {**info, "year": year, "quarter": q}
+            if info["year"] not in (None, year) or info["quarter"] not in (None, q):
+                continue
+            candidates.setdefault((info["source"], info["direction"]), []).append((info, f, path))
+
+    selected = {}
+    for key, items in candidates.items():
+        monthly = {}
+        for info, f, path in items:
+            if info["month"] is not None:
+                best = monthly.get(info["month"])
+                if best is None or (info["score"], f["mtime"]) > (best[0]["score"], best[1]["mtime"]):
+                    monthly[info["month"]] = (info, f, path)
+        if monthly:
+            selected[key] = [monthly[m][2] for m in sorted(monthly)]
+            continue
+        info, f, path = max(
+            items, key=lambda it: (it[0]["score"], it[0]["quarter"] is not None, it[1]["mtime"])
+        )
+        selected[key] = [path]
+
+    result = (selected, all_files)
+    for stale in [k for k in _discovery_cache if k[0] == quarter]:
+        del _discovery_cache[stale]  # 같은 분기의 이전 폴더 상태
+    _discovery_cache[cache_key] = result
+    return result
+
+
+def load_excel(filepath, use_cache=True):
+    """
+    엑셀 파일 로딩 — 헤더 행 자동 감지, COLUMN_MAP에 해당하는 컬럼만.
+    바뀌지 않은 파일은 이전 파싱 결과(input/.cache/)를 그대로 사용.
+    """
     if filepath is None:
         return None
     try:
-        df = pd.read_excel(filepath)
-        # 빈 행 제거
-        df = df.dropna(how='all')
+        if not use_cache:
+            return read_table(filepath, COLUMN_MAP)
+        from config import load_config
+        max_bytes = load_config()["parse_cache_mb"] * 1024 * 1024
+        df, _ = load_cached(filepath, lambda: read_table(filepath, COLUMN_MAP), COLUMN_MAP, max_bytes)
         return df
     except Exception as e:
         print(f"  ⚠️ 파일 로딩 실패: {filepath} → {e}")
         return None
 
 
+def cached_workbook(filepath):
+    """파싱 캐시에 있는 결과만 (없거나 읽을 수 없으면 None) — 프로세스 풀 없이 바로 확인."""
+    try:
+        return workbook_cache.get(workbook_cache.cache_key(filepath, COLUMN_MAP))
+    except OSError:
+        return None
+
+
+def _concat_frames(frames):
+    """같은 종류의 분할 파일(월별 등)을 이어 붙임 — 헤더 이름이 달라도 표준 컬럼 기준으로 맞춤"""
+    if len(frames) == 1:
+        return frames[0]
+    base = map_columns(frames[0])
+    aligned = []
+    for df in frames:
+        mapped = map_columns(df)
+        aligned.append(df.rename(columns={mapped[k]: base[k] for k in mapped if k in base}))
+    return pd.concat(aligned, ignore_index=True)
+
+
+def _pool_context():
+    """
+    프로세스 시작 방식 — 대시보드 서버처럼 스레드가 여러 개인 프로세스에서 fork하면
+    다른 스레드가 잡고 있던 잠금까지 복제되므로 spawn. 단일 스레드(CLI)는 기본값.
+    """
+    if threading.active_count() > 1:
+        return multiprocessing.get_context("spawn")
+    return None
+
+
+def pool_map(fn, calls, jobs=None, label="처리"):
+    """
+    fn(*args)를 프로세스 풀로 실행 (결과는 calls 순서대로).
+    jobs가 1이거나 할 일이 1개 이하, 또는 프로세스 풀을 쓸 수 없는 환경이면 순차 실행.
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(calls))
+    if jobs > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=_pool_context()) as pool:
+                return list(pool.map(fn, *zip(*calls)))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"  ⚠️ 병렬 {label} 불가 → 순차 {label} ({e})")
+    return [fn(*args) for args in calls]
+
+
+def load_workbooks(groups, jobs=None, use_cache=True):
+    """
+    여러 엑셀 파일을 프로세스 풀로 동시에 로딩.
+    파싱 캐시에 있는 파일은 이 프로세스에서 바로 불러오고, 파싱이 필요한 파일만 풀로 보냄
+    (모두 캐시에 있으면 풀을 만들지 않음).
+
+    Args:
+        groups: {이름: [파일 경로, ...]} — 한 이름에 파일이 여러 개면 이어 붙임
+        jobs: 동시 로딩 프로세스 수 (None이면 CPU 수, 1이면 순차)
+        use_cache: 파싱 캐시 사용 여부
+
+    Returns:
+        dict: {이름: DataFrame 또는 None}
+    """
+    paths = list(dict.fromkeys(p for files in groups.values() for p in files if p))
+    loaded = {}
+    if use_cache:
+        for p in paths:
+            df = cached_workbook(p)
+            if df is not None:
+                loaded[p] = df
+    misses = [p for p in paths if p not in loaded]
+    misses.sort(key=lambda p: os.path.getsize(p), reverse=True)  # 큰 파일부터 (작업 분배 균형)
+    loaded.update(zip(misses, pool_map(load_excel, [(p, use_cache) for p in misses], jobs, "로딩")))
+
+    result = {}
+    for name, files in groups.items():
+        frames = [loaded[p] for p in files if p and loaded[p] is not None]
+        result[name] = _concat_frames(frames) if frames else None
+    return result
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 2. 컬럼 자동 매핑 (이카운트/홈택스 엑셀 형식 대응)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -76,17 +307,7 @@ COLUMN_MAP = {
 
 def map_columns(df):
     """DataFrame 컬럼을 표준 이름으로 매핑"""
-    mapped = {}
-    for standard, candidates in COLUMN_MAP.items():
-        for col in df.columns:
-            col_clean = str(col).strip().replace(" ", "")
-            for cand in candidates:
-                if cand in col_clean:
-                    mapped[standard] = col
-                    break
-            if standard in mapped:
-                break
-    return mapped
+    return match_headers(df.columns, COLUMN_MAP)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -105,18 +326,263 @@ def normalize_amount(val):
     return int(val)
 
 
-def compare_data(ecount_df, hometax_df, label="매출"):
-    """이카운트 vs 홈택스 데이터 대조"""
+def normalize_amounts(series):
+    """
+    금액 컬럼 일괄 정규화 (normalize_amount의 벡터 버전).
+    문자열의 ',' '원' 공백 제거 → 숫자 변환 → 소수점 버림 → int64 (변환 불가/빈칸은 0)
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        numeric = series.astype("float64")
+    else:
+        cleaned = series.astype("string").str.replace(r"[,원\s]", "", regex=True)
+        numeric = pd.to_numeric(cleaned, errors="coerce")
+    return np.trunc(numeric.fillna(0)).astype("int64")
+
+
+def normalize_keys(series, by_biz_no):
+    """
+    매칭 키 정규화 — 사업자번호는 숫자만, 거래처명은 공백 제거 (빈 값은 NA).
+    엑셀에서 숫자로 읽힌 사업자번호(1234567890.0)도 같은 키가 되도록 처리.
+    """
+    keys = series.astype("string").str.strip()
+    if by_biz_no:
+        keys = keys.str.replace(r"\.0+$", "", regex=True).str.replace(r"\D", "", regex=True)
+    else:
+        keys = keys.str.replace(r"\s+", "", regex=True)
+    return keys.replace("", pd.NA)
+
+
+# 대조 결과 DataFrame 컬럼
+MISSING_IN_HOMETAX_COLUMNS = ["거래처", "이카운트금액"]
+MISSING_IN_ECOUNT_COLUMNS = ["거래처", "홈택스금액"]
+MISMATCH_COLUMNS = ["거래처", "이카운트", "홈택스", "차이"]
+
+
+def reconcile(ec_keys, ec_amounts, ht_keys, ht_amounts):
+    """
+    거래처별 합계를 키 기준 outer join 후 마스크로 분류.
+
+    Returns:
+        tuple: (홈택스 누락, 이카운트 누락, 금액 불일치) DataFrame
+    """
+    ec = ec_amounts.groupby(ec_keys).sum().rename_axis("거래처").rename("이카운트")
+    ht = ht_amounts.groupby(ht_keys).sum().rename_axis("거래처").rename("홈택스")
+    merged = ec.to_frame().merge(ht.to_frame(), left_index=True, right_index=True, how="outer")
+    merged = merged.fillna(0).astype("int64")
+
+    ec_val = merged["이카운트"]
+    ht_val = merged["홈택스"]
+    missing_ht = (ec_val > 0) & (ht_val == 0)
+    missing_ec = (ec_val == 0) & (ht_val > 0)
+    mismatch = ~missing_ht & ~missing_ec & ((ec_val - ht_val).abs() > 1)  # 1원 이상 차이
+
+    missing_in_hometax = (
+        merged.loc[missing_ht, ["이카운트"]].rename(columns={"이카운트": "이카운트금액"}).reset_index()
+    )
+    missing_in_ecount = (
+        merged.loc[missing_ec, ["홈택스"]].rename(columns={"홈택스": "홈택스금액"}).reset_index()
+    )
+    # 차이는 거른 뒤가 아니라 먼저 계산 (빈 프레임에 assign하면 Series 인덱스가 그대로 들어옴)
+    amount_mismatch = merged.assign(차이=ec_val - ht_val).loc[mismatch].reset_index()
+    return missing_in_hometax, missing_in_ecount, amount_mismatch[MISMATCH_COLUMNS]
+
+
+# ── 세금계산서(라인) 단위 대조 ──
+INVOICE_COLUMNS = ["일자", "거래처", "사업자번호", "전표번호", "공급가액", "세액"]
+INVOICE_MISMATCH_COLUMNS = [
+    "매칭", "불일치", "일자(이카운트)", "일자(홈택스)", "거래처", "사업자번호",
+    "전표번호(이카운트)", "전표번호(홈택스)",
+    "공급가액(이카운트)", "공급가액(홈택스)", "공급가액 차이",
+    "세액(이카운트)", "세액(홈택스)", "세액 차이",
+]
+AMOUNT_TOLERANCE = 1000  # 근사 매칭 허용 공급가액 차이 (원)
+DATE_TOLERANCE = 7       # 근사 매칭 허용 일자 차이 (일)
+
+
+def normalize_dates(series):
+    """일자 정규화 — 2026-01-05 / 2026.01.05 / 20260105 / datetime 모두 날짜(NaT 허용)로"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.normalize()
+    digits = series.astype("string").str.replace(r"\D", "", regex=True).str[:8]
+    return pd.to_datetime(digits, format="%Y%m%d", errors="coerce")
+
+
+def normalize_slips(series):
+    """전표/승인번호 정규화 — 영숫자만 남김 (빈 값은 NA)"""
+    slips = series.astype("string").str.replace(r"\.0+$", "", regex=True)
+    return slips.str.replace(r"[^0-9A-Za-z]", "", regex=True).replace("", pd.NA)
+
+
+def invoice_lines(df, colmap, amounts):
+    """대조용 라인 테이블 (정규화된 키·금액, row = 원본 행 순번, amounts = 정규화된 공급가액)"""
+    df = df.reset_index(drop=True)
+    empty = pd.Series(pd.NA, index=df.index, dtype="string")
+
+    def col(name):
+        return df[colmap[name]] if name in colmap else empty
+
+    return pd.DataFrame({
+        "row": np.arange(len(df)),
+        "date": normalize_dates(col("date")),
+        "partner": col("partner").astype("string"),
+        "biz": normalize_keys(col("biz_no"), True) if "biz_no" in colmap
+               else normalize_keys(col("partner"), False),
+        "slip": normalize_slips(col("slip_no")),
+        "supply": amounts.to_numpy(),
+        "tax": normalize_amounts(col("tax")) if "tax" in colmap else pd.Series(0, index=df.index, dtype="int64"),
+    })
+
+
+def _pair_exact(ec, ht, keys, how):
+    """
+    keys가 모두 같은 라인을 1:1로 짝지음 (같은 키가 여러 번이면 등장 순서대로).
+
+    Returns:
+        tuple: (짝 DataFrame [*_ec, *_ht, 매칭], 남은 이카운트, 남은 홈택스)
+    """
+    left = ec.dropna(subset=keys)
+    right = ht.dropna(subset=keys)
+    left = left.assign(_n=left.groupby(keys).cumcount()).add_suffix("_ec")
+    right = right.assign(_n=right.groupby(keys).cumcount()).add_suffix("_ht")
+    on = keys + ["_n"]
+    pairs = left.merge(
+        right, left_on=[k + "_ec" for k in on], right_on=[k + "_ht" for k in on]
+    ).drop(columns=["_n_ec", "_n_ht"])
+    pairs["매칭"] = how
+    return (
+        pairs,
+        ec[~ec["row"].isin(pairs["row_ec"])],
+        ht[~ht["row"].isin(pairs["row_ht"])],
+    )
+
+
+def _pair_nearest(ec, ht, amount_tolerance, date_tolerance, rounds=3):
+    """
+    남은 라인끼리 같은 사업자번호 안에서 공급가액이 가장 가까운 라인과 짝지음
+    (차이 amount_tolerance원·date_tolerance일 이내, 한 라인은 한 번만).
+    """
+    found = []
+    for _ in range(rounds):
+        left = ec.dropna(subset=["biz"]).sort_values("supply").add_suffix("_ec")
+        right = ht.dropna(subset=["biz"]).sort_values("supply").add_suffix("_ht")
+        if left.empty or right.empty:
+            break
+        left["biz_ec"] = left["biz_ec"].astype(object)
+        right["biz_ht"] = right["biz_ht"].astype(object)
+        pairs = pd.merge_asof(
+            left, right, left_on="supply_ec", right_on="supply_ht",
+            left_by="biz_ec", right_by="biz_ht",
+            direction="nearest", tolerance=amount_tolerance,
+        ).dropna(subset=["row_ht"])
+        for c in ("row_ht", "supply_ht", "tax_ht"):
+            pairs[c] = pairs[c].astype("int64")
+
+        gap = (pairs["date_ec"] - pairs["date_ht"]).abs()
+        pairs = pairs[gap.isna() | (gap <= pd.Timedelta(days=date_tolerance))]
+        # 여러 이카운트 라인이 같은 홈택스 라인을 고르면 가장 가까운 것만
+        pairs = (
+            pairs.assign(_dist=(pairs["supply_ec"] - pairs["supply_ht"]).abs())
+            .sort_values(["_dist", "row_ec"])
+            .drop_duplicates("row_ht")
+            .drop(columns="_dist")
+        )
+        if pairs.empty:
+            break
+        found.append(pairs)
+        ec = ec[~ec["row"].isin(pairs["row_ec"])]
+        ht = ht[~ht["row"].isin(pairs["row_ht"])]
+
+    pairs = pd.concat(found, ignore_index=True) if found else pd.DataFrame()
+    if not pairs.empty:
+        pairs["매칭"] = "근사"
+    return pairs, ec, ht
+
+
+def _invoice_table(lines):
+    """누락 라인 → 리포트용 DataFrame"""
+    return pd.DataFrame({
+        "일자": lines["date"].dt.strftime("%Y-%m-%d"),
+        "거래처": lines["partner"],
+        "사업자번호": lines["biz"],
+        "전표번호": lines["slip"],
+        "공급가액": lines["supply"],
+        "세액": lines["tax"],
+    }).reset_index(drop=True)[INVOICE_COLUMNS]
+
+
+def reconcile_invoices(ec, ht, amount_tolerance=AMOUNT_TOLERANCE, date_tolerance=DATE_TOLERANCE):
+    """
+    세금계산서(라인) 단위 대조.
+        1차: 전표/승인번호 일치
+        2차: 일자 + 사업자번호 + 공급가액 + 세액 일치
+        3차: 남은 라인끼리 같은 사업자번호 내 공급가액 최근접 (허용 오차 이내)
+
+    Returns:
+        tuple: (홈택스 누락, 이카운트 누락, 불일치) DataFrame
+    """
+    by_slip, ec, ht = _pair_exact(ec, ht, ["slip"], "전표번호")
+    by_key, ec, ht = _pair_exact(ec, ht, ["date", "biz", "supply", "tax"], "일자+사업자+금액")
+    nearest, ec, ht = _pair_nearest(ec, ht, amount_tolerance, date_tolerance)
+    pairs = pd.concat([p for p in (by_slip, by_key, nearest) if not p.empty], ignore_index=True)
+
+    if pairs.empty:
+        mismatch = pd.DataFrame(columns=INVOICE_MISMATCH_COLUMNS)
+    else:
+        supply_diff = pairs["supply_ec"] - pairs["supply_ht"]
+        tax_diff = pairs["tax_ec"] - pairs["tax_ht"]
+        date_diff = pairs["date_ec"].notna() & pairs["date_ht"].notna() & (pairs["date_ec"] != pairs["date_ht"])
+        flags = {"공급가액": supply_diff.abs() > 1, "세액": tax_diff.abs() > 1, "일자": date_diff}
+        bad = flags["공급가액"] | flags["세액"] | flags["일자"]
+        reasons = pd.Series("", index=pairs.index)
+        for name, flag in flags.items():
+            reasons = reasons.where(~flag, reasons + "," + name)
+        reasons = reasons[bad].str.lstrip(",")
+        p = pairs[bad]
+        mismatch = pd.DataFrame({
+            "매칭": p["매칭"],
+            "불일치": reasons,
+            "일자(이카운트)": p["date_ec"].dt.strftime("%Y-%m-%d"),
+            "일자(홈택스)": p["date_ht"].dt.strftime("%Y-%m-%d"),
+            "거래처": p["partner_ec"].fillna(p["partner_ht"]),
+            "사업자번호": p["biz_ec"].fillna(p["biz_ht"]),
+            "전표번호(이카운트)": p["slip_ec"],
+            "전표번호(홈택스)": p["slip_ht"],
+            "공급가액(이카운트)": p["supply_ec"],
+            "공급가액(홈택스)": p["supply_ht"],
+            "공급가액 차이": supply_diff[bad],
+            "세액(이카운트)": p["tax_ec"],
+            "세액(홈택스)": p["tax_ht"],
+            "세액 차이": tax_diff[bad],
+        }).reset_index(drop=True)[INVOICE_MISMATCH_COLUMNS]
+
+    return _invoice_table(ec), _invoice_table(ht), mismatch
+
+
+def compare_data(ecount_df, hometax_df, label="매출", mode="partner",
+                 amount_tolerance=AMOUNT_TOLERANCE, date_tolerance=DATE_TOLERANCE):
+    """
+    이카운트 vs 홈택스 데이터 대조.
+    missing_in_hometax / missing_in_ecount / amount_mismatch는 DataFrame.
+
+    Args:
+        mode: "partner" (거래처별 합계) 또는 "invoice" (세금계산서 라인 단위)
+        amount_tolerance, date_tolerance: invoice 모드 근사 매칭 허용 오차 (원, 일)
+    """
+    invoice_mode = mode == "invoice"
     results = {
         "label": label,
+        "mode": mode,
         "ecount_count": 0,
         "hometax_count": 0,
         "ecount_total": 0,
         "hometax_total": 0,
         "diff": 0,
-        "missing_in_hometax": [],  # 이카운트에만 있음 (홈택스 누락)
-        "missing_in_ecount": [],   # 홈택스에만 있음 (이카운트 누락)
-        "amount_mismatch": [],     # 금액 불일치
+        # 이카운트에만 있음 (홈택스 누락)
+        "missing_in_hometax": pd.DataFrame(columns=INVOICE_COLUMNS if invoice_mode else MISSING_IN_HOMETAX_COLUMNS),
+        # 홈택스에만 있음 (이카운트 누락)
+        "missing_in_ecount": pd.DataFrame(columns=INVOICE_COLUMNS if invoice_mode else MISSING_IN_ECOUNT_COLUMNS),
+        # 금액 불일치
+        "amount_mismatch": pd.DataFrame(columns=INVOICE_MISMATCH_COLUMNS if invoice_mode else MISMATCH_COLUMNS),
     }
 
     if ecount_df is None and hometax_df is None:
@@ -126,58 +592,49 @@ def compare_data(ecount_df, hometax_df, label="매출"):
     ec_map = map_columns(ecount_df) if ecount_df is not None else {}
     ht_map = map_columns(hometax_df) if hometax_df is not None else {}
 
+    # 금액 컬럼은 한 번만 정규화해서 합계·거래처별 집계에 재사용
+    ec_amt = ec_map.get("supply") or ec_map.get("total")
+    ht_amt = ht_map.get("supply") or ht_map.get("total")
+    ec_amounts = normalize_amounts(ecount_df[ec_amt]) if ecount_df is not None and ec_amt else None
+    ht_amounts = normalize_amounts(hometax_df[ht_amt]) if hometax_df is not None and ht_amt else None
+
     # 이카운트 합계
     if ecount_df is not None:
         results["ecount_count"] = len(ecount_df)
-        if "supply" in ec_map:
-            results["ecount_total"] = ecount_df[ec_map["supply"]].apply(normalize_amount).sum()
-        elif "total" in ec_map:
-            results["ecount_total"] = ecount_df[ec_map["total"]].apply(normalize_amount).sum()
+        if ec_amounts is not None:
+            results["ecount_total"] = ec_amounts.sum()
 
     # 홈택스 합계
     if hometax_df is not None:
         results["hometax_count"] = len(hometax_df)
-        if "supply" in ht_map:
-            results["hometax_total"] = hometax_df[ht_map["supply"]].apply(normalize_amount).sum()
-        elif "total" in ht_map:
-            results["hometax_total"] = hometax_df[ht_map["total"]].apply(normalize_amount).sum()
+        if ht_amounts is not None:
+            results["hometax_total"] = ht_amounts.sum()
 
     results["diff"] = results["ecount_total"] - results["hometax_total"]
 
+    # 세금계산서 라인 단위 대조
+    if invoice_mode:
+        if ecount_df is not None and hometax_df is not None and ec_amt and ht_amt:
+            (results["missing_in_hometax"],
+             results["missing_in_ecount"],
+             results["amount_mismatch"]) = reconcile_invoices(
+                invoice_lines(ecount_df, ec_map, ec_amounts), invoice_lines(hometax_df, ht_map, ht_amounts),
+                amount_tolerance, date_tolerance,
+            )
+        return results
+
     # 거래처 + 금액 기준 대조 (사업자번호가 있으면 사업자번호 우선)
     if ecount_df is not None and hometax_df is not None:
         # 매칭 키 결정
         ec_key = ec_map.get("biz_no") or ec_map.get("partner")
         ht_key = ht_map.get("biz_no") or ht_map.get("partner")
-        ec_amt = ec_map.get("supply") or ec_map.get("total")
-        ht_amt = ht_map.get("supply") or ht_map.get("total")
 
         if ec_key and ht_key and ec_amt and ht_amt:
-            # 거래처별 합계 비교
-            ec_grouped = ecount_df.groupby(ec_key)[ec_amt].apply(
-                lambda x: x.apply(normalize_amount).sum()
-            ).to_dict()
-            ht_grouped = hometax_df.groupby(ht_key)[ht_amt].apply(
-                lambda x: x.apply(normalize_amount).sum()
-            ).to_dict()
-
-            all_keys = set(list(ec_grouped.keys()) + list(ht_grouped.keys()))
-            for key in all_keys:
-                ec_val = ec_grouped.get(key, 0)
-                ht_val = ht_grouped.get(key, 0)
-                if ec_val > 0 and ht_val == 0:
-                    results["missing_in_hometax"].append({
-                        "거래처": key, "이카운트금액": ec_val
-                    })
-                elif ec_val == 0 and ht_val > 0:
-                    results["missing_in_ecount"].append({
-                        "거래처": key, "홈택스금액": ht_val
-                    })
-                elif abs(ec_val - ht_val) > 1:  # 1원 이상 차이
-                    results["amount_mismatch"].append({
-                        "거래처": key, "이카운트": ec_val, "홈택스": ht_val,
-                        "차이": ec_val - ht_val
-                    })
+            ec_keys = normalize_keys(ecount_df[ec_key], by_biz_no="biz_no" in ec_map)
+            ht_keys = normalize_keys(hometax_df[ht_key], by_biz_no="biz_no" in ht_map)
+            (results["missing_in_hometax"],
+             results["missing_in_ecount"],
+             results["amount_mismatch"]) = reconcile(ec_keys, ec_amounts, ht_keys, ht_amounts)
 
     return results
 
@@ -190,24 +647,90 @@ GOLD = "E8B931"
 LIGHT_GRAY = "F5F5F5"
 
 
-def create_report(sell_results, buy_results, quarter):
-    """대조 결과를 엑셀 리포트로 생성"""
-    wb = Workbook()
+# 리포트 표시용 헤더 (DataFrame 컬럼명과 다른 것만)
+REPORT_HEADERS = {"이카운트금액": "이카운트 금액", "홈택스금액": "홈택스 금액"}
+
+# 숫자 서식 — 값은 숫자 셀로 쓰고 표시만 천단위/단위/부호
+FMT_NUMBER = "#,##0"
+FMT_SIGNED = "+#,##0;-#,##0;0"
+FMT_WON = '#,##0"원"'
+FMT_WON_SIGNED = '+#,##0"원";-#,##0"원";0"원"'
+FMT_COUNT = '#,##0"건"'
+FMT_COUNT_SIGNED = '+#,##0"건";-#,##0"건";0"건"'
+REPORT_CHUNK_ROWS = 5000  # 불일치 표를 이 행 수씩 변환해서 기록
+
 
-    # 스타일 정의
-    header_font = Font(name="맑은 고딕", bold=True, color="FFFFFF", size=11)
-    header_fill = PatternFill(start_color=NAVY, end_color=NAVY, fill_type="solid")
-    gold_fill = PatternFill(start_color=GOLD, end_color=GOLD, fill_type="solid")
+def _report_styles():
+    """리포트 공용 이름 스타일 (워크북에 한 번만 등록, 셀은 이름으로 참조)"""
+    thin = Side(style="thin")
     warn_fill = PatternFill(start_color="FFE0E0", end_color="FFE0E0", fill_type="solid")
     ok_fill = PatternFill(start_color="E0FFE0", end_color="E0FFE0", fill_type="solid")
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
+    return [
+        NamedStyle("vat_title", font=Font(name="맑은 고딕", bold=True, size=16, color=NAVY)),
+        NamedStyle("vat_heading", font=Font(name="맑은 고딕", bold=True, size=12)),
+        NamedStyle(
+            "vat_header",
+            font=Font(name="맑은 고딕", bold=True, color="FFFFFF", size=11),
+            fill=PatternFill(start_color=NAVY, end_color=NAVY, fill_type="solid"),
+            alignment=Alignment(horizontal="center"),
+            border=Border(left=thin, right=thin, top=thin, bottom=thin),
+        ),
+        NamedStyle("vat_number", number_format=FMT_NUMBER),
+        NamedStyle("vat_signed", number_format=FMT_SIGNED),
+        NamedStyle("vat_count", number_format=FMT_COUNT),
+        NamedStyle("vat_count_signed", number_format=FMT_COUNT_SIGNED),
+        NamedStyle("vat_won", number_format=FMT_WON),
+        NamedStyle("vat_won_total", number_format=FMT_WON, font=Font(bold=True, size=12, color=NAVY)),
+        NamedStyle("vat_diff_warn", number_format=FMT_WON_SIGNED, fill=warn_fill),
+        NamedStyle("vat_diff_ok", number_format=FMT_WON_SIGNED, fill=ok_fill),
+    ]
+
+
+def styled(ws, value, style):
+    """write-only 시트용 스타일 셀"""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+def append_section(ws, title, df):
+    """불일치 시트에 제목 + 표 추가 (행이 없으면 생략). 금액은 천단위, 차이는 부호 서식의 숫자 셀."""
+    if not len(df):
+        return
+    ws.append([title])
+    ws.append([REPORT_HEADERS.get(c, c) for c in df.columns])
+
+    # 숫자 컬럼은 서식 지정 셀 하나를 행마다 재사용 — write-only 시트는 append 즉시 기록하므로 안전
+    cells = [
+        styled(ws, None, "vat_signed" if "차이" in c else "vat_number")
+        if pd.api.types.is_numeric_dtype(df[c]) else None
+        for c in df.columns
+    ]
+    for start in range(0, len(df), REPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + REPORT_CHUNK_ROWS]
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            out = []
+            for v, cell in zip(row, cells):
+                if v is None or cell is None:
+                    out.append(v)
+                else:
+                    cell.value = v
+                    out.append(cell)
+            ws.append(out)
+
+
+def create_report(sell_results, buy_results, quarter):
+    """
+    대조 결과를 엑셀 리포트로 생성.
+    write-only 모드로 행을 바로 파일에 기록 → 불일치 행 수와 무관하게 메모리 일정.
+    """
+    wb = Workbook(write_only=True)
+    for style in _report_styles():
+        wb.add_named_style(style)
 
     # ── 요약 시트 ──
-    ws = wb.active
-    ws.title = "요약"
+    ws = wb.create_sheet("요약")
     ws.column_dimensions['A'].width = 25
     ws.column_dimensions['B'].width = 20
     ws.column_dimensions['C'].width = 20
@@ -215,135 +738,347 @@ def create_report(sell_results, buy_results, quarter):
 
     from config import load_config
     cfg = load_config()
-    ws.append([f"{cfg['company_name']} 부가세 셀프 체크", "", "", ""])
-    ws.merge_cells("A1:D1")
-    ws['A1'].font = Font(name="맑은 고딕", bold=True, size=16, color=NAVY)
+    ws.append([styled(ws, f"{cfg['company_name']} 부가세 셀프 체크", "vat_title")])
 
     ws.append([f"기간: {quarter}", "", "작성일:", datetime.now().strftime("%Y-%m-%d")])
     ws.append([])
 
     # 요약 테이블
     headers = ["구분", "이카운트", "홈택스", "차이"]
-    ws.append(headers)
-    for col in range(1, 5):
-        cell = ws.cell(row=4, column=col)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
-        cell.border = thin_border
+    ws.append([styled(ws, h, "vat_header") for h in headers])
 
     for res in [sell_results, buy_results]:
-        row = [
+        ws.append([
             f"{res['label']} 건수",
-            f"{res['ecount_count']:,}건",
-            f"{res['hometax_count']:,}건",
-            f"{res['ecount_count'] - res['hometax_count']:+,}건"
-        ]
-        ws.append(row)
-        row = [
+            styled(ws, res["ecount_count"], "vat_count"),
+            styled(ws, res["hometax_count"], "vat_count"),
+            styled(ws, res["ecount_count"] - res["hometax_count"], "vat_count_signed"),
+        ])
+        ws.append([
             f"{res['label']} 공급가액",
-            f"{res['ecount_total']:,.0f}원",
-            f"{res['hometax_total']:,.0f}원",
-            f"{res['diff']:+,.0f}원"
-        ]
-        ws.append(row)
-        # 차이에 색상 적용
-        r = ws.max_row
-        diff_cell = ws.cell(row=r, column=4)
-        if abs(res['diff']) > 0:
-            diff_cell.fill = warn_fill
-        else:
-            diff_cell.fill = ok_fill
+            styled(ws, res["ecount_total"], "vat_won"),
+            styled(ws, res["hometax_total"], "vat_won"),
+            styled(ws, res["diff"], "vat_diff_warn" if abs(res["diff"]) > 0 else "vat_diff_ok"),  # 차이는 색으로 표시
+        ])
 
     ws.append([])
 
     # 부가세 예상 계산
-    sell_tax = sell_results["ecount_total"] * 0.1
-    buy_tax = buy_results["ecount_total"] * 0.1
+    sell_tax = round(sell_results["ecount_total"] * 0.1)
+    buy_tax = round(buy_results["ecount_total"] * 0.1)
     payable = sell_tax - buy_tax
 
-    ws.append(["부가세 예상 (이카운트 기준)"])
-    ws.cell(row=ws.max_row, column=1).font = Font(name="맑은 고딕", bold=True, size=12)
-    ws.append(["매출세액 (10%)", f"{sell_tax:,.0f}원"])
-    ws.append(["매입세액 (10%)", f"{buy_tax:,.0f}원"])
-    ws.append(["납부예상세액", f"{payable:,.0f}원"])
-    ws.cell(row=ws.max_row, column=2).font = Font(bold=True, size=12, color=NAVY)
+    ws.append([styled(ws, "부가세 예상 (이카운트 기준)", "vat_heading")])
+    ws.append(["매출세액 (10%)", styled(ws, sell_tax, "vat_won")])
+    ws.append(["매입세액 (10%)", styled(ws, buy_tax, "vat_won")])
+    ws.append(["납부예상세액", styled(ws, payable, "vat_won_total")])
 
     # ── 누락/불일치 시트 ──
     for res in [sell_results, buy_results]:
         ws2 = wb.create_sheet(f"{res['label']}_불일치")
 
-        if res["missing_in_hometax"]:
-            ws2.append([f"홈택스 누락 (이카운트에만 있음) — {len(res['missing_in_hometax'])}건"])
-            ws2.append(["거래처", "이카운트 금액"])
-            for item in res["missing_in_hometax"]:
-                ws2.append([item["거래처"], f"{item['이카운트금액']:,.0f}"])
-
+        append_section(ws2, f"홈택스 누락 (이카운트에만 있음) — {len(res['missing_in_hometax'])}건",
+                       res["missing_in_hometax"])
         ws2.append([])
-
-        if res["missing_in_ecount"]:
-            ws2.append([f"이카운트 누락 (홈택스에만 있음) — {len(res['missing_in_ecount'])}건"])
-            ws2.append(["거래처", "홈택스 금액"])
-            for item in res["missing_in_ecount"]:
-                ws2.append([item["거래처"], f"{item['홈택스금액']:,.0f}"])
-
+        append_section(ws2, f"이카운트 누락 (홈택스에만 있음) — {len(res['missing_in_ecount'])}건",
+                       res["missing_in_ecount"])
         ws2.append([])
+        append_section(ws2, f"금액 불일치 — {len(res['amount_mismatch'])}건", res["amount_mismatch"])
 
-        if res["amount_mismatch"]:
-            ws2.append([f"금액 불일치 — {len(res['amount_mismatch'])}건"])
-            ws2.append(["거래처", "이카운트", "홈택스", "차이"])
-            for item in res["amount_mismatch"]:
-                ws2.append([
-                    item["거래처"],
-                    f"{item['이카운트']:,.0f}",
-                    f"{item['홈택스']:,.0f}",
-                    f"{item['차이']:+,.0f}"
-                ])
-
-        if not res["missing_in_hometax"] and not res["missing_in_ecount"] and not res["amount_mismatch"]:
+        if not len(res["missing_in_hometax"]) and not len(res["missing_in_ecount"]) and not len(res["amount_mismatch"]):
             ws2.append(["✅ 불일치 항목 없음"])
 
-    # 저장
+    # 저장 — 임시파일에 쓴 뒤 rename (대시보드가 쓰다 만 리포트를 내려주지 않도록)
     output_path = OUTPUT_DIR / f"부가세체크_{quarter}.xlsx"
-    wb.save(output_path)
+    tmp = OUTPUT_DIR / f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        wb.save(tmp)
+        os.replace(tmp, output_path)
+    finally:
+        tmp.unlink(missing_ok=True)
     return output_path
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 5. 메인 실행
+# 5. 분기 대조 실행 / 여러 분기 일괄 대조
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SLOTS = {
+    "ec_sell": ("ecount", "매출"),
+    "ec_buy": ("ecount", "매입"),
+    "ht_sell": ("hometax", "매출"),
+    "ht_buy": ("hometax", "매입"),
+}
+
+
+def check_quarter(quarter, frames, mode="partner", tolerances=None):
+    """
+    한 분기 대조 + 리포트 생성 (프로세스 풀 작업 단위).
+
+    Args:
+        frames: {"ec_sell", "ec_buy", "ht_sell", "ht_buy": DataFrame 또는 None}
+
+    Returns:
+        tuple: (매출 결과, 매입 결과, 리포트 경로)
+    """
+    tolerances = tolerances or {}
+    sell_results = compare_data(frames["ec_sell"], frames["ht_sell"], "매출", mode, **tolerances)
+    buy_results = compare_data(frames["ec_buy"], frames["ht_buy"], "매입", mode, **tolerances)
+    output_path = create_report(sell_results, buy_results, quarter)
+    return sell_results, buy_results, output_path
+
+
+def print_summary(sell_results, buy_results):
+    for res in [sell_results, buy_results]:
+        print(f"\n  [{res['label']}]")
+        print(f"  이카운트: {res['ecount_count']:,}건 / {res['ecount_total']:,.0f}원")
+        print(f"  홈택스:   {res['hometax_count']:,}건 / {res['hometax_total']:,.0f}원")
+        print(f"  차이:     {res['diff']:+,.0f}원")
+
+        issues = len(res["missing_in_hometax"]) + len(res["missing_in_ecount"]) + len(res["amount_mismatch"])
+        if issues > 0:
+            print(f"  ⚠️  확인 필요: {issues}건")
+        else:
+            print(f"  ✅ 일치")
+
+
+def run_check(quarter, mode="partner", tolerances=None, jobs=None, use_cache=True, progress=None):
+    """
+    한 분기 셀프 체크 전체 실행 (파일 탐색 → 로딩 → 컬럼 매핑 → 대조 → 리포트).
+
+    Args:
+        progress: progress(단계, 메시지) 콜백 — 단계는 vat_constants.STAGES 중 하나 (대시보드·CLI 진행 표시용)
+
+    Returns:
+        tuple: (매출 결과, 매입 결과, 리포트 경로) — input/에 엑셀이 없으면 None
+    """
+    notify = progress or (lambda stage, message: None)
+    tolerances = tolerances or {}
+
+    notify("discover", "input/ 폴더 파일 탐색")
+    selected, all_files = discover_inputs(quarter)
+    if not all_files:
+        return None
+    groups = {slot: selected.get(key, []) for slot, key in SLOTS.items()}
+
+    notify("loading", f"엑셀 {sum(len(files) for files in groups.values())}개 로딩")
+    frames = load_workbooks(groups, jobs, use_cache)
+
+    # 금액 컬럼을 못 찾은 파일은 합계가 0으로 나오므로 미리 알림
+    warnings = []
+    for slot, (source, direction) in SLOTS.items():
+        df = frames[slot]
+        if df is None:
+            warnings.append(f"{source}_{direction}: 파일 없음")
+        elif not {"supply", "total"} & set(map_columns(df)):
+            warnings.append(f"{source}_{direction}: 금액 컬럼을 찾지 못함")
+    notify("mapping", " / ".join(warnings) or "컬럼 확인 완료")
+
+    notify("comparing", "매출·매입 대조")
+    sell_results = compare_data(frames["ec_sell"], frames["ht_sell"], "매출", mode, **tolerances)
+    buy_results = compare_data(frames["ec_buy"], frames["ht_buy"], "매입", mode, **tolerances)
+
+    notify("writing", f"부가세체크_{quarter}.xlsx")
+    output_path = create_report(sell_results, buy_results, quarter)
+    return sell_results, buy_results, output_path
+
+
+def summarize_results(res, limit=10):
+    """대조 결과 → JSON 응답용 요약 (불일치 표는 앞 limit행만)."""
+    issues = {}
+    for key in ("missing_in_hometax", "missing_in_ecount", "amount_mismatch"):
+        df = res[key]
+        rows = df.head(limit).to_json(orient="records", date_format="iso", force_ascii=False)
+        issues[key] = {"count": len(df), "rows": json.loads(rows)}
+    return {
+        "label": res["label"],
+        "mode": res["mode"],
+        "ecount_count": int(res["ecount_count"]),
+        "hometax_count": int(res["hometax_count"]),
+        "ecount_total": float(res["ecount_total"]),
+        "hometax_total": float(res["hometax_total"]),
+        "diff": float(res["diff"]),
+        "issue_count": sum(item["count"] for item in issues.values()),
+        "issues": issues,
+    }
+
+
+def quarter_range(start, end):
+    """2025Q3, 2026Q2 → [2025Q3, 2025Q4, 2026Q1, 2026Q2]"""
+    return [str(p) for p in pd.period_range(pd.Period(start, "Q"), pd.Period(end, "Q"), freq="Q")]
+
+
+def partition_by_quarter(df, quarters):
+    """
+    일자 컬럼 기준으로 행을 분기별로 나눔 (벡터 연산 + groupby 한 번).
+
+    Returns:
+        tuple: ({분기: DataFrame}, 일자를 알 수 없는 행 수) — 일자 컬럼이 없으면 (None, 0)
+    """
+    date_col = map_columns(df).get("date")
+    if date_col is None:
+        return None, 0
+    periods = normalize_dates(df[date_col]).dt.to_period("Q")
+    undated = int(periods.isna().sum())
+    labels = periods.astype("string").to_numpy()
+    wanted = set(quarters)
+    parts = {q: part for q, part in df.groupby(labels, sort=False) if q in wanted}
+    return parts, undated
+
+
+def rollup_results(results, label):
+    """분기별 결과 → 기간 합계 결과 (누락/불일치 표 앞에 분기 컬럼 추가)"""
+    first = results[0][1]
+    total = {"label": label, "mode": first["mode"]}
+    for key in ("ecount_count", "hometax_count", "ecount_total", "hometax_total", "diff"):
+        total[key] = sum(r[key] for _, r in results)
+    for key in ("missing_in_hometax", "missing_in_ecount", "amount_mismatch"):
+        tables = [r[key].assign(분기=quarter) for quarter, r in results]
+        table = pd.concat(tables, ignore_index=True)
+        total[key] = table[["분기"] + [c for c in table.columns if c != "분기"]]
+    return total
+
+
+def _is_quarter_file(path):
+    """파일명(분기·월 표시)이나 분기 폴더로 한 분기 자료임이 분명한 파일인지"""
+    return path.parent != INPUT_DIR or classify_workbook(path.name)["quarter"] is not None
+
+
+def run_batch(quarters, args, report_name):
+    """
+    여러 분기 일괄 대조 — 파일은 한 번씩만 읽고 일자로 분기를 나눈 뒤
+    분기별 대조·리포트를 프로세스 풀에서 실행, 마지막에 기간 합계 리포트 생성.
+    """
+    print("\n📂 input/ 폴더 파일 탐색...")
+    # 파일마다 어느 분기 자료로 쓰이는지 (연간 파일은 여러 분기, 분기 파일은 한 분기)
+    serves = {}  # (slot, path) → [분기]
+    for quarter in quarters:
+        selected, _ = discover_inputs(quarter)
+        for slot, key in SLOTS.items():
+            for path in selected.get(key, []):
+                serves.setdefault((slot, path), []).append(quarter)
+    if not serves:
+        print("\n⚠️  input/ 폴더에 대조할 엑셀 파일이 없습니다.")
+        return
+    for (slot, path), qs in serves.items():
+        print(f"   - {slot}: {path.name} ({qs[0]}{'~' + qs[-1] if len(qs) > 1 else ''})")
+
+    print("\n📊 데이터 로딩...")
+    paths = list(dict.fromkeys(path for _, path in serves))
+    loaded = load_workbooks({path: [path] for path in paths}, args.jobs, not args.no_cache)
+
+    # 분기별 입력 구성
+    per_quarter = {q: {slot: [] for slot in SLOTS} for q in quarters}
+    for (slot, path), qs in serves.items():
+        df = loaded[path]
+        if df is None:
+            continue
+        if _is_quarter_file(path):
+            per_quarter[qs[0]][slot].append(df)  # 분기·월 전용 파일은 전체 행 사용 (단일 분기 실행과 동일)
+            continue
+        parts, undated = partition_by_quarter(df, qs)
+        if parts is None:
+            print(f"  ⚠️ {path.name}: 일자 컬럼이 없어 분기를 나눌 수 없습니다 — 제외")
+            continue
+        if undated:
+            print(f"  ⚠️ {path.name}: 일자를 알 수 없는 {undated:,}건 제외")
+        for q, part in parts.items():
+            per_quarter[q][slot].append(part)
+
+    empty = [q for q, slots in per_quarter.items() if not any(slots.values())]
+    if empty:
+        print(f"  ℹ️ 자료 없는 분기 제외: {', '.join(empty)}")
+    quarters = [q for q in quarters if q not in empty]
+    if not quarters:
+        print("\n⚠️  해당 기간의 자료가 없습니다.")
+        return
+    calls = [
+        (q, {slot: _concat_frames(dfs) if dfs else None for slot, dfs in per_quarter[q].items()},
+         args.mode, _tolerances(args))
+        for q in quarters
+    ]
+
+    print(f"\n🔍 대조 실행... ({len(calls)}개 분기)")
+    outcomes = pool_map(check_quarter, calls, args.jobs, "대조")
+
+    print(f"\n{'─'*50}")
+    for quarter, (sell_results, buy_results, output_path) in zip(quarters, outcomes):
+        print(f"\n■ {quarter} → {output_path.name}")
+        print_summary(sell_results, buy_results)
+
+    sell_total = rollup_results([(q, o[0]) for q, o in zip(quarters, outcomes)], "매출")
+    buy_total = rollup_results([(q, o[1]) for q, o in zip(quarters, outcomes)], "매입")
+    output_path = create_report(sell_total, buy_total, report_name)
+
+    print(f"\n{'─'*50}")
+    print(f"\n■ {report_name} 합계")
+    print_summary(sell_total, buy_total)
+    print(f"\n📄 리포트 생성 완료: 분기별 {len(outcomes)}개 + 합계 {output_path}")
+    print(f"   open \"{output_path}\"")
+
+
+def _tolerances(args):
+    return {"amount_tolerance": args.amount_tolerance, "date_tolerance": args.date_tolerance}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 6. 메인 실행
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 def main():
     parser = argparse.ArgumentParser(description="부가세 셀프 체크 도구")
     parser.add_argument("--quarter", default=None, help="분기 (예: 2026Q1)")
+    parser.add_argument("--from", dest="start", default=None, help="일괄 대조 시작 분기 (예: 2025Q1)")
+    parser.add_argument("--to", dest="end", default=None, help="일괄 대조 끝 분기 (예: 2026Q2)")
+    parser.add_argument("--year", type=int, default=None, help="연간 일괄 대조 (1~4분기)")
+    parser.add_argument("--mode", choices=["partner", "invoice"], default="partner",
+                        help="대조 단위: partner=거래처별 합계, invoice=세금계산서 건별")
+    parser.add_argument("--amount-tolerance", type=int, default=AMOUNT_TOLERANCE,
+                        help="invoice 모드 근사 매칭 허용 공급가액 차이 (원)")
+    parser.add_argument("--date-tolerance", type=int, default=DATE_TOLERANCE,
+                        help="invoice 모드 근사 매칭 허용 일자 차이 (일)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="엑셀 파싱 캐시를 쓰지 않고 항상 다시 읽기")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="동시에 읽을 엑셀 파일 수 (기본: CPU 코어 수, 1이면 순차)")
     args = parser.parse_args()
 
+    for name in ("quarter", "start", "end"):
+        value = getattr(args, name)
+        if value is not None and not QUARTER_PATTERN.match(value):
+            parser.error(f"분기 형식이 아닙니다: {value} (예: 2026Q1)")
+    if args.quarter and (args.year or args.start or args.end):
+        parser.error("--quarter와 --from/--to/--year는 함께 쓸 수 없습니다")
+
     # 분기 자동 설정
     now = datetime.now()
     q = (now.month - 1) // 3 + 1
     quarter = args.quarter or f"{now.year}Q{q}"
 
+    # 일괄 대조 기간
+    quarters = None
+    if args.year:
+        quarters = quarter_range(f"{args.year}Q1", f"{args.year}Q4")
+        report_name = f"{args.year}년"
+    elif args.start or args.end:
+        quarters = quarter_range(args.start or args.end, args.end or quarter)
+        if not quarters:
+            parser.error("--from 분기가 --to 분기보다 늦습니다")
+        report_name = f"{quarters[0]}-{quarters[-1]}"
+
     from config import load_config
     cfg = load_config()
 
     print("=" * 50)
     print(f"  {cfg['company_name']} 부가세 셀프 체크")
-    print(f"  기간: {quarter}")
+    print(f"  기간: {', '.join(quarters) if quarters else quarter}")
     print("=" * 50)
 
+    if quarters:
+        run_batch(quarters, args, report_name)
+        return
+
     # 파일 탐색
     print("\n📂 input/ 폴더 파일 탐색...")
-    files = {
-        "ecount_매출": find_file("ecount") and find_file("매출"),
-        "ecount_매입": find_file("ecount") and find_file("매입"),
-        "hometax_매출": find_file("hometax") and find_file("매출"),
-        "hometax_매입": find_file("hometax") and find_file("매입"),
-    }
-
-    # 좀 더 유연한 탐색
-    ec_sell = find_file("매출") if not files["ecount_매출"] else files["ecount_매출"]
-    ec_buy = find_file("매입") if not files["ecount_매입"] else files["ecount_매입"]
-
-    all_files = list(INPUT_DIR.glob("*.xlsx")) + list(INPUT_DIR.glob("*.xls"))
+    selected, all_files = discover_inputs(quarter)
     if not all_files:
         print("\n⚠️  input/ 폴더에 엑셀 파일이 없습니다.")
         print("\n📋 아래 파일을 넣어주세요:")
@@ -355,52 +1090,30 @@ def main():
         return
 
     print(f"   발견된 파일: {len(all_files)}개")
-    for f in all_files:
-        print(f"   - {f.name}")
+    for source, direction in SLOTS.values():
+        names = ", ".join(f.name for f in selected.get((source, direction), [])) or "없음"
+        print(f"   - {source}_{direction}: {names}")
 
-    # 데이터 로딩
-    print("\n📊 데이터 로딩...")
-    ec_sell_df = load_excel(ec_sell)
-    ec_buy_df = load_excel(ec_buy)
-
-    ht_sell = None
-    ht_buy = None
-    for f in all_files:
-        name = f.name.lower()
-        if "hometax" in name or "홈택스" in name:
-            if "매출" in name or "sell" in name:
-                ht_sell = f
-            elif "매입" in name or "buy" in name:
-                ht_buy = f
-
-    ht_sell_df = load_excel(ht_sell)
-    ht_buy_df = load_excel(ht_buy)
-
-    # 대조 실행
-    print("\n🔍 대조 실행...")
-    sell_results = compare_data(ec_sell_df, ht_sell_df, "매출")
-    buy_results = compare_data(ec_buy_df, ht_buy_df, "매입")
+    # 로딩 → 컬럼 매핑 → 대조 → 리포트 생성
+    titles = {"loading": "📊 데이터 로딩", "mapping": "🧭 컬럼 매핑", "comparing": "🔍 대조 실행", "writing": "📄 리포트 생성"}
+
+    def show_progress(stage, message):
+        if stage in titles:
+            print(f"\n{titles[stage]}... {message}")
+
+    sell_results, buy_results, output_path = run_check(
+        quarter, args.mode, _tolerances(args), args.jobs, not args.no_cache, show_progress
+    )
 
     # 결과 출력
     print(f"\n{'─'*50}")
-    for res in [sell_results, buy_results]:
-        print(f"\n  [{res['label']}]")
-        print(f"  이카운트: {res['ecount_count']:,}건 / {res['ecount_total']:,.0f}원")
-        print(f"  홈택스:   {res['hometax_count']:,}건 / {res['hometax_total']:,.0f}원")
-        print(f"  차이:     {res['diff']:+,.0f}원")
+    print_summary(sell_results, buy_results)
 
-        issues = len(res["missing_in_hometax"]) + len(res["missing_in_ecount"]) + len(res["amount_mismatch"])
-        if issues > 0:
-            print(f"  ⚠️  확인 필요: {issues}건")
-        else:
-            print(f"  ✅ 일치")
-
-    # 리포트 생성
     print(f"\n{'─'*50}")
-    output_path = create_report(sell_results, buy_results, quarter)
     print(f"\n📄 리포트 생성 완료: {output_path}")
     print(f"   open \"{output_path}\"")
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # PyInstaller 번들에서 프로세스 풀 사용
     main()
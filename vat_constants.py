@@ -0,0 +1,12 @@
+"""
+부가세 셀프 체크 공용 상수 (pandas 없이 불러올 수 있는 모듈)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+vat_checker(대조 엔진·CLI)와 vat_jobs(대시보드 백그라운드 작업)가 함께 씀.
+표시 이름·진행률은 각자 (대시보드: vat_jobs, CLI: vat_checker.main).
+"""
+import re
+
+QUARTER_PATTERN = re.compile(r"^\d{4}Q[1-4]$")
+
+# run_check의 progress 콜백 단계 (실행 순서)
+STAGES = ("discover", "loading", "mapping", "comparing", "writing")
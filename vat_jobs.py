@@ -0,0 +1,231 @@
+"""
+부가세 셀프 체크 백그라운드 작업
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+대시보드에서 요청한 분기 대조(vat_checker.run_check)를 요청 스레드 밖에서 실행합니다.
+
+- 작업 스레드 MAX_WORKERS개로 제한, 나머지는 대기열 (요청은 즉시 응답)
+- 같은 분기·입력 폴더 상태·옵션으로 진행 중인 작업이 있으면 새로 만들지 않고 공유
+- 입력 파일이 그대로고 리포트도 남아 있으면 다시 계산하지 않고 이전 결과 반환
+- 단계(loading → mapping → comparing → writing)가 바뀔 때마다 events로 push (event: job)
+
+작업 정보는 메모리에만 보관 (서버 재시작 시 초기화).
+vat_checker(pandas·openpyxl)는 작업 스레드에서만 불러옴 — 요청 스레드는 file_index 조회만 하고 바로 응답.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from events import publish
+from file_index import version as index_version
+from paths import INPUT_DIR
+from vat_constants import QUARTER_PATTERN
+
+MAX_WORKERS = 2     # 동시에 실행할 대조 작업 수 (파일 로딩은 작업마다 프로세스 풀 사용)
+MAX_HISTORY = 20    # 보관할 끝난 작업 수
+
+MODES = ("partner", "invoice")
+TOLERANCES = ("amount_tolerance", "date_tolerance")
+
+# 대조 단계 (vat_constants.STAGES) → 대시보드 표시 이름
+STAGE_LABELS = {
+    "discover": "📂 파일 탐색",
+    "loading": "📊 데이터 로딩",
+    "mapping": "🧭 컬럼 매핑",
+    "comparing": "🔍 대조 실행",
+    "writing": "📄 리포트 생성",
+}
+# 단계별 진행률 (%) — 로딩이 대부분의 시간을 차지
+PROGRESS = {"queued": 0, "discover": 5, "loading": 10, "mapping": 60, "comparing": 70, "writing": 85, "done": 100}
+
+_lock = threading.Lock()
+_jobs = {}                                # id → 작업
+_quarter_locks = defaultdict(threading.Lock)  # 같은 분기 리포트 파일을 동시에 쓰지 않도록
+_executor = None
+
+
+class JobError(Exception):
+    """잘못된 작업 요청 (분기·대조 방식·허용 오차 형식 등) — status는 API 응답 코드"""
+    status = 400
+
+
+class JobNotFound(JobError):
+    """없는 작업, 아직 끝나지 않았거나 리포트가 바뀐 작업"""
+    status = 404
+
+
+def input_version(quarter: str) -> list:
+    """
+    분기 대조 입력 폴더(input/, input/{분기}/)의 파일 구성 버전 — 바뀌면 다시 계산.
+    file_index 캐시 조회라 요청 스레드에서 불러도 엑셀·pandas를 건드리지 않음.
+    """
+    return [index_version(INPUT_DIR)[0], index_version(INPUT_DIR / quarter)[0]]
+
+
+def validate(quarter: str, mode: str, tolerances: dict):
+    """작업 파라미터 확인 (잘못되면 JobError → 400)."""
+    if not QUARTER_PATTERN.match(quarter or ""):
+        raise JobError(f"분기 형식이 아닙니다: {quarter} (예: 2026Q1)")
+    if mode not in MODES:
+        raise JobError(f"알 수 없는 대조 방식: {mode}")
+    for name, value in tolerances.items():
+        if name not in TOLERANCES:
+            raise JobError(f"알 수 없는 허용 오차: {name}")
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise JobError(f"허용 오차는 0 이상의 정수여야 합니다: {name}={value}")
+
+
+def public(job: dict) -> dict:
+    """API 응답·이벤트용 작업 정보."""
+    return {
+        "job_id": job["id"],
+        "quarter": job["quarter"],
+        "mode": job["mode"],
+        "state": job["status"],   # queued | running | done | error
+        "stage": job["stage"],
+        "stage_label": STAGE_LABELS.get(job["stage"], ""),
+        "progress": PROGRESS.get(job["stage"], 0),
+        "message": job["message"],
+        "created": job["created"],
+        "finished": job["finished"],
+        "result": job["result"],
+        "report": Path(job["report"]).name if job["report"] else None,
+        "error": job["error"],
+    }
+
+
+def _update(job: dict, **fields):
+    with _lock:
+        job.update(fields)
+        data = public(job)
+    publish("job", data)
+
+
+def _report_valid(job: dict) -> bool:
+    """끝난 작업의 리포트가 그 뒤로 덮어써지지 않고 남아 있는지."""
+    try:
+        return os.stat(job["report"]).st_mtime_ns == job["report_mtime"]
+    except (TypeError, FileNotFoundError):
+        return False
+
+
+def _prune():
+    """오래된 끝난 작업 정리. _lock 보유 상태에서 호출."""
+    finished = sorted(
+        (j for j in _jobs.values() if j["status"] in ("done", "error")),
+        key=lambda j: j["finished"],
+    )
+    for job in finished[:-MAX_HISTORY]:
+        del _jobs[job["id"]]
+
+
+def _run(job: dict):
+    import vat_checker
+
+    def progress(stage, message):
+        _update(job, stage=stage, message=message)
+
+    try:
+        with _quarter_locks[job["quarter"]]:
+            _update(job, status="running")
+            outcome = vat_checker.run_check(
+                job["quarter"], job["mode"], job["tolerances"], progress=progress
+            )
+            if outcome is None:
+                raise RuntimeError("input/ 폴더에 이카운트·홈택스 엑셀 파일이 없습니다")
+            sell_results, buy_results, output_path = outcome
+            report_mtime = os.stat(output_path).st_mtime_ns
+        _update(
+            job,
+            status="done",
+            stage="done",
+            message="완료",
+            finished=time.time(),
+            report=str(output_path),
+            report_mtime=report_mtime,
+            result={
+                "sell": vat_checker.summarize_results(sell_results),
+                "buy": vat_checker.summarize_results(buy_results),
+            },
+        )
+    except Exception as e:
+        _update(job, status="error", message="실패", finished=time.time(), error=str(e))
+
+
+def submit(quarter: str, mode: str = "partner", tolerances: dict = None):
+    """
+    분기 대조 작업 등록 (바로 반환, 파일 탐색·로딩은 모두 작업 스레드에서).
+    파라미터가 잘못되면 JobError.
+
+    Returns:
+        tuple: (작업 정보, 새로 만든 작업인지) — 진행 중이거나 결과가 유효한 같은 작업이 있으면 그 작업
+    """
+    global _executor
+    tolerances = tolerances or {}
+    validate(quarter, mode, tolerances)
+    key = [quarter, mode, sorted(tolerances.items()), input_version(quarter)]
+
+    with _lock:
+        for job in sorted(_jobs.values(), key=lambda j: j["created"], reverse=True):
+            if job["key"] != key:
+                continue
+            if job["status"] in ("queued", "running"):
+                return public(job), False
+            if job["status"] == "done" and _report_valid(job):
+                return public(job), False
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "key": key,
+            "quarter": quarter,
+            "mode": mode,
+            "tolerances": tolerances,
+            "status": "queued",
+            "stage": "queued",
+            "message": "대기 중",
+            "created": time.time(),
+            "finished": None,
+            "result": None,
+            "report": None,
+            "report_mtime": None,
+            "error": None,
+        }
+        _jobs[job["id"]] = job
+        _prune()
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="vat-check")
+        _executor.submit(_run, job)
+        data = public(job)
+    publish("job", data)
+    return data, True
+
+
+def get(job_id: str) -> dict:
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            raise JobNotFound("작업이 없습니다 (만료되었거나 서버가 재시작됨)")
+        return public(job)
+
+
+def latest(quarter: str):
+    """분기의 가장 최근 작업 (없으면 None)."""
+    with _lock:
+        jobs = [j for j in _jobs.values() if j["quarter"] == quarter]
+        if not jobs:
+            return None
+        return public(max(jobs, key=lambda j: j["created"]))
+
+
+def report_path(job_id: str) -> Path:
+    """끝난 작업의 리포트 파일 (이후 다른 작업이 덮어썼으면 JobError)."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None or job["status"] != "done":
+            raise JobNotFound("완료된 작업이 아닙니다")
+        if not _report_valid(job):
+            raise JobNotFound("리포트가 이후 작업으로 바뀌었습니다 — 다시 실행해주세요")
+        return Path(job["report"])
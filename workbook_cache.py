@@ -0,0 +1,130 @@
+"""
+엑셀 파싱 결과 캐시
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+부가세 셀프 체크를 다시 돌릴 때 바뀌지 않은 엑셀은 파싱하지 않고
+이전에 읽은 DataFrame을 input/.cache/에서 바로 불러옵니다.
+
+- 키: 파일 경로 + 크기 + 수정시각 + 내용 해시 (+ 컬럼 맵) — 하나라도 다르면 다시 파싱
+- 저장 형식: Parquet (pyarrow 설치 시) → 없으면 pickle
+- 전체 크기가 한도를 넘으면 가장 오래 안 쓴 캐시부터 삭제 (LRU, 파일 mtime 기준)
+- 인덱스 파일이 없어 여러 프로세스가 동시에 써도 안전 (파일 단위 원자적 rename)
+
+사용법:
+    from workbook_cache import load_cached
+    df = load_cached(path, lambda: read_table(path, COLUMN_MAP), COLUMN_MAP)
+"""
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from hash_store import file_sha256
+from paths import INPUT_DIR
+
+CACHE_DIR = INPUT_DIR / ".cache"
+CACHE_VERSION = 1  # 저장 내용이 바뀌면 올려서 기존 캐시 무효화
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+try:
+    import pyarrow  # noqa: F401 — Parquet 저장용 (선택)
+    FORMAT = ".parquet"
+except ImportError:
+    FORMAT = ".pkl"
+
+
+def cache_key(path: Path, extra=None) -> str:
+    """경로·크기·수정시각·내용 해시(+ extra)로 만든 캐시 키."""
+    path = Path(path).resolve()
+    st = os.stat(path)
+    parts = [CACHE_VERSION, str(path), st.st_size, st.st_mtime_ns, file_sha256(path), extra]
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _entry_path(key: str, suffix: str = FORMAT) -> Path:
+    return CACHE_DIR / f"{key}{suffix}"
+
+
+def get(key: str):
+    """캐시된 DataFrame (없거나 깨졌으면 None). 읽으면 최근 사용으로 표시."""
+    for suffix in (FORMAT, ".pkl"):
+        path = _entry_path(key, suffix)
+        if not path.exists():
+            continue
+        try:
+            df = pd.read_parquet(path) if suffix == ".parquet" else pd.read_pickle(path)
+        except Exception:
+            path.unlink(missing_ok=True)  # 쓰다 만 파일 / 버전 불일치
+            continue
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return df
+    return None
+
+
+def put(key: str, df: pd.DataFrame, max_bytes: int = DEFAULT_MAX_BYTES):
+    """DataFrame 저장 후 한도 초과분 정리."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _entry_path(key)
+    tmp = CACHE_DIR / f".{key}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        if FORMAT == ".parquet":
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        tmp.unlink(missing_ok=True)  # 캐시 저장 실패는 무시 (다음에 다시 파싱)
+        return
+    evict(max_bytes)
+
+
+def evict(max_bytes: int = DEFAULT_MAX_BYTES):
+    """총 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 캐시 삭제."""
+    entries = []
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    except FileNotFoundError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        Path(path).unlink(missing_ok=True)
+        total -= size
+
+
+def load_cached(path: Path, parse, extra=None, max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    캐시에 있으면 불러오고, 없으면 parse()로 읽어서 저장.
+
+    Args:
+        path: 원본 엑셀 파일
+        parse: 인자 없는 파싱 함수 (DataFrame 또는 None 반환)
+        extra: 키에 포함할 추가 값 (컬럼 맵 등 — 바뀌면 다시 파싱)
+        max_bytes: 캐시 전체 크기 한도
+
+    Returns:
+        tuple: (DataFrame 또는 None, 캐시 사용 여부)
+    """
+    key = cache_key(path, extra)
+    df = get(key)
+    if df is not None:
+        return df, True
+    df = parse()
+    if df is not None:
+        put(key, df, max_bytes)
+    return df, False